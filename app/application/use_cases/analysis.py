@@ -2,6 +2,7 @@
 Analysis use case: Run all required analyses and generate reports.
 """
 
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -52,6 +53,7 @@ class RunAnalysisUseCase:
         report_service: ReportService | None = None,
         forecast_months: int = 1,
         min_months_for_forecast: int = 3,
+        pretty_json: bool = False,
     ):
         """
         Initialize analysis use case.
@@ -62,6 +64,7 @@ class RunAnalysisUseCase:
             report_service: Report service (optional).
             forecast_months: Number of months to forecast.
             min_months_for_forecast: Minimum months required for forecast.
+            pretty_json: Indent the saved JSON results for human reading.
         """
         self.warehouse = warehouse
         self.viz_service = viz_service or VisualizationService(
@@ -72,6 +75,7 @@ class RunAnalysisUseCase:
         )
         self.forecast_months = forecast_months
         self.min_months_for_forecast = min_months_for_forecast
+        self.pretty_json = pretty_json
 
     def execute(
         self,
@@ -92,8 +96,21 @@ class RunAnalysisUseCase:
 
         report_dir, metadata_dir = self.report_service.create_report_folder()
 
+        viz_executor: ThreadPoolExecutor | None = None
+        viz_future: Future[dict[str, str]] | None = None
         if generate_plots:
             self.viz_service = VisualizationService(metadata_dir)
+            # Plots only read the warehouse, so they render on a worker
+            # while the aggregates below run. A :memory: warehouse has a
+            # single shared connection and renders them inline instead.
+            if not self.warehouse.in_memory:
+                logger.info("Generating visualizations in background...")
+                viz_executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="visualizations"
+                )
+                viz_future = viz_executor.submit(
+                    self._generate_visualizations_in_read_session
+                )
 
         session = self.warehouse.get_session()
 
@@ -123,9 +140,8 @@ class RunAnalysisUseCase:
             )
 
             logger.info("Calculating last month revenue...")
-            results["last_month_revenue"] = (
-                transaction_repo.get_last_month_revenue()
-            )
+            dashboard = transaction_repo.get_dashboard_bundle(12)
+            results["last_month_revenue"] = dashboard["last_month_revenue"]
 
             logger.info("Analyzing client segments...")
             results["client_segments"] = (
@@ -133,19 +149,14 @@ class RunAnalysisUseCase:
             )
 
             logger.info("Running additional analyses...")
-            results["service_performance"] = (
-                transaction_repo.get_service_performance()
-            )
             results["service_performance"] = (
                 transaction_repo.enrich_with_percentages(
-                    results["service_performance"]
+                    dashboard["service_performance"]
                 )
             )
 
             logger.info("Calculating monthly trend...")
-            results["monthly_trend"] = (
-                transaction_repo.get_monthly_revenue_trend(12)
-            )
+            results["monthly_trend"] = dashboard["monthly_trend"]
 
             results["clients_without_transactions"] = (
                 client_repo.get_clients_without_transactions()
@@ -160,8 +171,11 @@ class RunAnalysisUseCase:
             results["forecast"] = forecast
 
             if generate_plots:
-                logger.info("Generating visualizations...")
-                viz_results = self._generate_visualizations(session)
+                if viz_future is not None:
+                    viz_results = viz_future.result()
+                else:
+                    logger.info("Generating visualizations...")
+                    viz_results = self._generate_visualizations(session)
                 json_path = self._save_json_results(results, metadata_dir)
                 viz_results["json_data"] = str(json_path)
                 md_path = self.report_service.save_markdown_report(
@@ -190,6 +204,8 @@ class RunAnalysisUseCase:
 
         finally:
             session.close()
+            if viz_executor is not None:
+                viz_executor.shutdown(wait=True, cancel_futures=True)
 
     def _save_json_results(
         self,
@@ -200,24 +216,34 @@ class RunAnalysisUseCase:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         json_path = output_dir / f"analysis_results_{timestamp}.json"
 
+        # orjson handles datetimes and numpy values natively; only paths
+        # need help.
         def json_serializer(obj):
             if isinstance(obj, Path):
                 return str(obj)
-            if isinstance(obj, datetime):
-                return obj.isoformat()
             raise TypeError(f"Type {type(obj)} not serializable")
 
-        with open(json_path, "w", encoding="utf-8") as f:
-            json_bytes = orjson.dumps(
-                results,
-                default=json_serializer,
-                option=orjson.OPT_INDENT_2,
-            )
-            f.write(json_bytes.decode("utf-8"))
+        option = (
+            orjson.OPT_APPEND_NEWLINE
+            | orjson.OPT_SERIALIZE_NUMPY
+            | orjson.OPT_NON_STR_KEYS
+        )
+        if self.pretty_json:
+            option |= orjson.OPT_INDENT_2
+
+        # orjson already produces UTF-8, so the bytes go to disk as-is.
+        json_path.write_bytes(
+            orjson.dumps(results, default=json_serializer, option=option)
+        )
 
         logger.info(f"Saved JSON results: {json_path}")
         return json_path
 
+    def _generate_visualizations_in_read_session(self) -> dict[str, str]:
+        """Generate all visualizations in a session of their own."""
+        with self.warehouse.read_session() as session:
+            return self._generate_visualizations(session)
+
     def _generate_visualizations(self, session) -> dict[str, str]:
         """
         Generate all visualizations.
@@ -296,6 +322,7 @@ def run_analysis(
     generate_plots: bool = True,
     forecast_months: int = 1,
     min_months_for_forecast: int = 3,
+    pretty_json: bool = False,
 ) -> dict[str, Any]:
     """
     Run analysis with default configuration.
@@ -305,16 +332,20 @@ def run_analysis(
         generate_plots: Whether to generate visualizations.
         forecast_months: Number of months to forecast.
         min_months_for_forecast: Minimum months required for forecast.
+        pretty_json: Indent the saved JSON results for human reading.
 
     Returns:
         Dict with all analysis results.
     """
-    warehouse = create_warehouse(db_path)
+    warehouse = create_warehouse(
+        db_path, strict_loading=config.database.strict_loading
+    )
     use_case = RunAnalysisUseCase(
         config,
         warehouse,
         forecast_months=forecast_months,
         min_months_for_forecast=min_months_for_forecast,
+        pretty_json=pretty_json,
     )
 
     try:
@@ -2,13 +2,17 @@
 ETL use case: Extract -> Clean -> Load data into warehouse.
 """
 
+from collections.abc import Iterator
 from pathlib import Path
+from typing import Any, ClassVar
 
 from structlog import get_logger
 
+from app.domain.entities import Client, Transaction
 from app.infrastructure.data_cleaning import ClientCleaner, TransactionCleaner
 from app.infrastructure.data_loading import LoaderFactory
 from app.infrastructure.database import (
+    AnalysisRepository,
     ClientRepository,
     TransactionRepository,
     Warehouse,
@@ -27,6 +31,8 @@ class BuildWarehouseUseCase:
     3. Load: Save cleaned data to SQLite
     """
 
+    DATA_FINGERPRINTS_RESULT: ClassVar[str] = "data_fingerprints"
+
     def __init__(
         self,
         warehouse: Warehouse,
@@ -41,18 +47,21 @@ class BuildWarehouseUseCase:
             warehouse: Database warehouse instance.
             loader_factory: Factory for creating data loaders.
             transaction_cleaner: Cleaner for transactions.
-            client_cleaner: Cleaner for clients.
+            client_cleaner: Cleaner for clients. When omitted, clients are
+                bulk-loaded as rows the loader has already validated
+                against the default ClientCleaner rules.
         """
         self.warehouse = warehouse
         self.loader_factory = loader_factory or LoaderFactory()
         self.transaction_cleaner = transaction_cleaner or TransactionCleaner()
-        self.client_cleaner = client_cleaner or ClientCleaner()
+        self.client_cleaner = client_cleaner
 
     def execute(
         self,
         transactions_path: Path,
         clients_path: Path,
         clear_existing: bool = False,
+        data_fingerprints: dict[str, Any] | None = None,
     ) -> dict[str, int]:
         """
         Run the ETL pipeline.
@@ -61,6 +70,9 @@ class BuildWarehouseUseCase:
             transactions_path: Path to transactions Excel file.
             clients_path: Path to clients JSON file.
             clear_existing: If True, clear database before loading.
+            data_fingerprints: Fingerprints of the source files, stored
+                with the load so the warehouse records what it was
+                built from.
 
         Returns:
             Dict with counts of loaded records.
@@ -71,34 +83,42 @@ class BuildWarehouseUseCase:
             self.warehouse.clear_all()
             logger.info("Cleared existing data")
 
-        session = self.warehouse.get_session()
+        with self.warehouse.bulk_load() as session:
+            try:
+                transactions_loaded = self._load_transactions(
+                    session, transactions_path
+                )
 
-        try:
-            transactions_loaded = self._load_transactions(
-                session, transactions_path
-            )
+                clients_loaded = self._load_clients(session, clients_path)
+                TransactionRepository(session).sync_client_attributes()
 
-            clients_loaded = self._load_clients(session, clients_path)
+                if data_fingerprints:
+                    AnalysisRepository(session).save_result(
+                        self.DATA_FINGERPRINTS_RESULT, data_fingerprints
+                    )
 
-            session.commit()
+                session.commit()
 
-            result = {
-                "transactions_loaded": transactions_loaded,
-                "clients_loaded": clients_loaded,
-            }
+                result = {
+                    "transactions_loaded": transactions_loaded,
+                    "clients_loaded": clients_loaded,
+                }
 
-            logger.info(f"ETL completed: {result}")
-            return result
+                logger.info(f"ETL completed: {result}")
+                return result
 
-        except Exception as e:
-            session.rollback()
-            logger.error(f"ETL failed: {e}")
-            raise
-        finally:
-            session.close()
+            except Exception as e:
+                session.rollback()
+                logger.error(f"ETL failed: {e}")
+                raise
 
     def _load_transactions(self, session, path: Path) -> int:
-        """Load and clean transactions."""
+        """
+        Load and clean transactions.
+
+        Cleaned transactions are streamed into a single add_many call,
+        which batches the inserts itself.
+        """
 
         loader = self.loader_factory.get_transaction_loader(path)
         repo = TransactionRepository(session)
@@ -106,43 +126,74 @@ class BuildWarehouseUseCase:
         count = 0
         skipped = 0
 
-        for raw_transaction in loader.load(path):
-            cleaned = self.transaction_cleaner.clean(raw_transaction)
+        def cleaned_transactions() -> Iterator[Transaction]:
+            nonlocal count, skipped
+            for raw_transaction in loader.load(path):
+                cleaned = self.transaction_cleaner.clean(raw_transaction)
+                if cleaned:
+                    count += 1
+                    yield cleaned
+                else:
+                    skipped += 1
 
-            if cleaned:
-                repo.add(cleaned)
-                count += 1
-
-                if count % 1000 == 0:
-                    session.flush()
-                    logger.debug(f"Processed {count} transactions")
-            else:
-                skipped += 1
+        repo.add_many(cleaned_transactions())
 
         logger.info(f"Transactions: {count} loaded, {skipped} skipped")
         return count
 
     def _load_clients(self, session, path: Path) -> int:
-        """Load and clean clients."""
+        """
+        Load clients as pre-validated row batches.
+
+        The loader already enforces the default ClientCleaner rules (id
+        present, age in range, non-negative net worth), so rows go
+        straight to a bulk insert without building Client entities. A
+        custom client_cleaner is applied to Client entities instead.
+        """
+        if self.client_cleaner is not None:
+            return self._load_clients_with_cleaner(
+                session, path, self.client_cleaner
+            )
 
         loader = self.loader_factory.get_client_loader(path)
         repo = ClientRepository(session)
 
+        count = 0
+
+        for rows in loader.load_rows(path):
+            repo.add_rows(rows)
+            count += len(rows)
+            logger.debug(f"Processed {count} clients")
+
+        logger.info(f"Clients: {count} loaded, {loader.skipped} skipped")
+        return count
+
+    def _load_clients_with_cleaner(
+        self, session, path: Path, cleaner: ClientCleaner
+    ) -> int:
+        """Load clients through a custom ClientCleaner."""
+        loader = self.loader_factory.get_client_loader(path)
+        repo = ClientRepository(session)
+
         count = 0
         skipped = 0
+        batch: list[Client] = []
 
         for raw_client in loader.load(path):
-            cleaned = self.client_cleaner.clean(raw_client)
+            cleaned = cleaner.clean(raw_client)
+            if cleaned is None:
+                skipped += 1
+                continue
 
-            if cleaned:
-                repo.add(cleaned)
-                count += 1
+            batch.append(cleaned)
+            if len(batch) >= 1000:
+                repo.add_many(batch)
+                count += len(batch)
+                batch.clear()
+                logger.debug(f"Processed {count} clients")
 
-                if count % 1000 == 0:
-                    session.flush()
-                    logger.debug(f"Processed {count} clients")
-            else:
-                skipped += 1
+        repo.add_many(batch)
+        count += len(batch)
 
         logger.info(f"Clients: {count} loaded, {skipped} skipped")
         return count
@@ -153,6 +204,7 @@ def build_warehouse(
     clients_path: Path | str,
     db_path: Path | str = ":memory:",
     clear: bool = False,
+    data_fingerprints: dict[str, Any] | None = None,
 ) -> dict[str, int]:
     """
     Build the warehouse with default configuration.
@@ -162,6 +214,7 @@ def build_warehouse(
         clients_path: Path to clients JSON file.
         db_path: Path to SQLite database.
         clear: If True, clear existing data.
+        data_fingerprints: Source file fingerprints to store with the load.
 
     Returns:
         Dict with counts of loaded records.
@@ -169,10 +222,14 @@ def build_warehouse(
     transactions_path = Path(transactions_path)
     clients_path = Path(clients_path)
 
-    warehouse = create_warehouse(db_path)
+    # A clearing build replaces the data anyway, so an outdated schema
+    # is simply recreated.
+    warehouse = create_warehouse(db_path, reset_outdated_schema=clear)
     use_case = BuildWarehouseUseCase(warehouse)
 
     try:
-        return use_case.execute(transactions_path, clients_path, clear)
+        return use_case.execute(
+            transactions_path, clients_path, clear, data_fingerprints
+        )
     finally:
         warehouse.close()
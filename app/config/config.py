@@ -92,11 +92,21 @@ class AnalysisConfig(BaseSettings):
     )
 
 
+class DatabaseConfig(BaseSettings):
+    """Configuration for the warehouse database."""
+
+    strict_loading: bool = Field(
+        default=False,
+        description="Raise on relationship loads not requested explicitly",
+    )
+
+
 class AppConfig(BaseSettings):
     """Main application configuration."""
 
     data_paths: DataPathsConfig = Field(default_factory=DataPathsConfig)
     analysis: AnalysisConfig = Field(default_factory=AnalysisConfig)
+    database: DatabaseConfig = Field(default_factory=DatabaseConfig)
     logger: LoggingConfig = Field(default_factory=LoggingConfig)
 
     model_config = SettingsConfigDict(
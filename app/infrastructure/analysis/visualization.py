@@ -17,6 +17,10 @@ from app.domain.entities import NetWorthLevel
 
 logger = get_logger(__name__)
 
+# Plots are only ever saved to files, and may be rendered off the main
+# thread, which GUI backends do not support.
+mpl.use("Agg")
+
 
 class VisualizationService:
     """Service for creating data visualizations."""
@@ -6,7 +6,7 @@ from pathlib import Path
 
 from structlog import get_logger
 
-from app.domain.entities import Client, Transaction
+from app.domain.entities import Transaction
 
 from .excel_loader import TransactionExcelLoader
 from .interfaces import DataLoader
@@ -70,7 +70,7 @@ class LoaderFactory:
             )
         return loader
 
-    def get_client_loader(self, source: Path) -> DataLoader[Client]:
+    def get_client_loader(self, source: Path) -> ClientJsonLoader:
         """Get loader for clients."""
         loader = self.get_loader(source)
         if not isinstance(loader, ClientJsonLoader):
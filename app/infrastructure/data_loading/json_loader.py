@@ -2,11 +2,21 @@
 JSON data loader implementation with orjson.
 """
 
-from collections.abc import Iterator
+import itertools
+import logging
+import math
+import mmap
+import multiprocessing
+import os
+import stat
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, ClassVar
+from typing import Any, ClassVar, NamedTuple, TypedDict
 from uuid import UUID
 
+import numpy as np
 import orjson
 from structlog import get_logger
 
@@ -16,6 +26,90 @@ from .interfaces import JsonLoader
 
 logger = get_logger(__name__)
 
+_NULL_SENTINELS = frozenset({"null", "none", ""})
+
+
+class FileProbe(NamedTuple):
+    """Cached file metadata used for format detection."""
+
+    size: int
+    first_char: bytes
+
+
+class ClientRow(TypedDict):
+    """Validated client record keyed by ClientTable column names."""
+
+    id: str
+    age: int
+    gender: str
+    net_worth: float
+
+
+class RangeResult(NamedTuple):
+    """Rows parsed by a worker, with the diagnostics it did not log."""
+
+    rows: list[ClientRow]
+    skipped: int
+    errors: int
+    messages: list[tuple[int, str]]
+
+
+@lru_cache(maxsize=256)
+def _probe(path_str: str, mtime_ns: int, size: int) -> FileProbe:
+    """
+    Read the first structural character of a file.
+
+    Keyed on modification time and size, so repeated checks of an
+    unchanged file within a run cost a single stat() call.
+    """
+    with open(path_str, "rb") as f:
+        head = f.read(64)
+    return FileProbe(size=size, first_char=head.lstrip()[:1])
+
+
+def _to_nan(value: Any) -> float:
+    """Fallback parser for unsupported value types."""
+    return math.nan
+
+
+def _number_to_float(value: int | float) -> float:
+    """Convert a JSON number to float."""
+    try:
+        return float(value)
+    except OverflowError:
+        return math.nan
+
+
+def _age_str_to_float(value: str) -> float:
+    """Parse age given as a string."""
+    value = value.strip()
+    if len(value) <= 4 and value.lower() in _NULL_SENTINELS:
+        return math.nan
+    try:
+        return float(value)
+    except ValueError:
+        return math.nan
+
+
+def _net_worth_str_to_float(value: str) -> float:
+    """Parse net worth given as a string (comma decimals, exponents)."""
+    str_value = value.strip()
+    if len(str_value) <= 4 and str_value.lower() in _NULL_SENTINELS:
+        return math.nan
+
+    str_value = str_value.replace(" ", "")
+
+    if "," in str_value and "." not in str_value:
+        str_value = str_value.replace(",", ".")
+
+    if "e" in str_value.lower():
+        str_value = str_value.lower()
+
+    try:
+        return float(str_value)
+    except ValueError:
+        return math.nan
+
 
 class ClientJsonLoader(JsonLoader[Client]):
     """
@@ -35,15 +129,49 @@ class ClientJsonLoader(JsonLoader[Client]):
     MAX_FILE_SIZE = 100 * 1024 * 1024
     MAX_RECORD_SIZE = 1024 * 1024
     MAX_CHUNK_SIZE = 10000
-
-    def __init__(self, chunk_size: int = 1000):
+    PARALLEL_MIN_FILE_SIZE = 32 * 1024 * 1024
+
+    GENDER_MAP: ClassVar = {
+        "Мужчина": Gender.MALE,
+        "Женщина": Gender.FEMALE,
+        "Другой": Gender.OTHER,
+    }
+
+    _AGE_PARSERS: ClassVar[dict[type, Callable[[Any], float]]] = {
+        int: _number_to_float,
+        float: _number_to_float,
+        str: _age_str_to_float,
+    }
+    _NET_WORTH_PARSERS: ClassVar[dict[type, Callable[[Any], float]]] = {
+        int: _number_to_float,
+        float: _number_to_float,
+        str: _net_worth_str_to_float,
+    }
+
+    def __init__(self, chunk_size: int = 1000, workers: int | None = None):
         """
         Initialize JSON loader.
 
         Args:
             chunk_size: Number of records per chunk for streaming.
+            workers: Processes used to parse large JSON lines files.
+                Defaults to the CPU count.
         """
         self.chunk_size = min(chunk_size, self.MAX_CHUNK_SIZE)
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        # Set in worker processes, whose log output nothing would drain;
+        # diagnostics are collected here and logged by the parent.
+        self._reports: list[tuple[int, str]] | None = None
+        self._line_errors = 0
+        # Records rejected by the most recent load_rows() call.
+        self.skipped = 0
+
+    def _report(self, level: int, message: str) -> None:
+        """Log a parsing diagnostic, or collect it inside a worker."""
+        if self._reports is not None:
+            self._reports.append((level, message))
+        else:
+            logger.log(level, message)
 
     def supports(self, source: Path) -> bool:
         """Check if file is JSON."""
@@ -51,15 +179,21 @@ class ClientJsonLoader(JsonLoader[Client]):
             return False
         return source.suffix.lower() == ".json"
 
-    def _validate_file(self, source: Path) -> None:
-        """Validate file before processing."""
-        if not source.exists():
-            raise FileNotFoundError(f"JSON file not found: {source}")
-
-        if not source.is_file():
+    def _probe_file(self, source: Path) -> FileProbe:
+        """Stat the file and return its cached probe."""
+        st = source.stat()
+        if not stat.S_ISREG(st.st_mode):
             raise ValueError(f"Path is not a file: {source}")
+        return _probe(str(source), st.st_mtime_ns, st.st_size)
+
+    def _validate_file(self, source: Path) -> FileProbe:
+        """Validate file before processing."""
+        try:
+            probe = self._probe_file(source)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"JSON file not found: {source}") from None
 
-        file_size = source.stat().st_size
+        file_size = probe.size
         if file_size > self.MAX_FILE_SIZE:
             raise ValueError(
                 f"File too large: {file_size} bytes > {self.MAX_FILE_SIZE} "
@@ -69,6 +203,8 @@ class ClientJsonLoader(JsonLoader[Client]):
         if file_size == 0:
             raise ValueError(f"File is empty: {source}")
 
+        return probe
+
     def load(self, source: Path) -> Iterator[Client]:
         """
         Load clients from JSON file using orjson.
@@ -83,19 +219,54 @@ class ClientJsonLoader(JsonLoader[Client]):
         Yields:
             Client entities.
         """
-        self._validate_file(source)
+        for rows in self.load_rows(source):
+            for row in rows:
+                try:
+                    yield Client(
+                        id=UUID(row["id"]),
+                        age=row["age"],
+                        gender=Gender(row["gender"]),
+                        net_worth=row["net_worth"],
+                    )
+                except ValueError as e:
+                    logger.warning(f"Failed to build client: {e}")
+
+    def load_rows(self, source: Path) -> Iterator[list[ClientRow]]:
+        """
+        Load validated client records in batches, without building entities.
+
+        Rows are shaped for direct bulk insertion into ClientTable. The
+        number of records rejected along the way is left in
+        self.skipped once the generator is exhausted.
+
+        Args:
+            source: Path to JSON file.
+
+        Yields:
+            Lists of at most chunk_size client rows.
+        """
+        probe = self._validate_file(source)
+        self.skipped = 0
 
         logger.info(f"Loading clients from {source}")
 
         try:
-            with open(source, "rb") as f:
-                first_byte = f.read(1)
-                f.seek(0)
+            if probe.first_char != b"[" and (
+                self.workers > 1 and probe.size >= self.PARALLEL_MIN_FILE_SIZE
+            ):
+                yield from self._load_lines_parallel(source, probe.size)
+                return
 
-                if first_byte == b"[":
-                    yield from self._load_array_safe(f)
-                else:
-                    yield from self._load_lines_safe(f)
+            with open(source, "rb") as f:
+                chunks = (
+                    self._load_array_safe(f)
+                    if probe.first_char == b"["
+                    else self._load_lines_safe(f)
+                )
+                for chunk in chunks:
+                    rows = self._process_chunk_safe(chunk)
+                    if rows:
+                        yield rows
 
         except orjson.JSONDecodeError as e:
             logger.error(f"JSON decode error in {source}: {e}")
@@ -104,7 +275,7 @@ class ClientJsonLoader(JsonLoader[Client]):
             logger.error(f"Failed to load JSON file: {e}")
             raise
 
-    def _load_array_safe(self, file) -> Iterator[Client]:
+    def _load_array_safe(self, file) -> Iterator[list[dict]]:
         """Safely load from JSON array using orjson."""
         try:
             data = orjson.loads(file.read())
@@ -120,121 +291,262 @@ class ClientJsonLoader(JsonLoader[Client]):
 
         logger.info(f"Found {len(data)} clients in JSON array")
 
-        valid_count = 0
-        for item in data:
-            client = self._dict_to_client(item)
-            if client:
-                valid_count += 1
-                yield client
+        for start in range(0, len(data), self.chunk_size):
+            yield data[start : start + self.chunk_size]
+
+    def _load_lines_safe(self, file) -> Iterator[list[dict]]:
+        """
+        Safely load from JSON lines format using orjson.
 
-        logger.debug(f"Successfully parsed {valid_count}/{len(data)} clients")
+        The file is memory-mapped and split on newlines with mmap.find,
+        avoiding Python-level line iteration over the file object.
+        """
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield from self._iter_line_chunks(mm)
 
-    def _load_lines_safe(self, file) -> Iterator[Client]:
-        """Safely load from JSON lines format using orjson."""
+    def _load_lines_parallel(
+        self, source: Path, size: int
+    ) -> Iterator[list[ClientRow]]:
+        """
+        Parse a large JSON lines file in a process pool.
+
+        The file is split into one byte range per worker, with each
+        boundary moved forward to the next newline. Workers return plain
+        row dicts, which are re-batched here in file order.
+        """
+        with (
+            open(source, "rb") as f,
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+        ):
+            bounds = [0]
+            for i in range(1, self.workers):
+                nl = mm.find(b"\n", max(i * size // self.workers, bounds[-1]))
+                if nl == -1:
+                    break
+                bounds.append(nl + 1)
+            bounds.append(size)
+
+            ranges = [
+                (lo, hi) for lo, hi in itertools.pairwise(bounds) if lo < hi
+            ]
+            # Line number each range starts on, so workers report
+            # absolute line numbers.
+            first_lines = [1]
+            for lo, hi in ranges[:-1]:
+                first_lines.append(
+                    first_lines[-1] + _count_newlines(mm, lo, hi)
+                )
+
+        logger.debug(f"Parsing {source.name} in {len(ranges)} byte ranges")
+
+        # spawn, not fork: the parent already runs the log listener thread,
+        # and forking a multi-threaded process can deadlock.
+        with ProcessPoolExecutor(
+            max_workers=len(ranges),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as executor:
+            results = executor.map(
+                _parse_range,
+                itertools.repeat(str(source)),
+                [lo for lo, _ in ranges],
+                [hi for _, hi in ranges],
+                itertools.repeat(self.chunk_size),
+                first_lines,
+            )
+            skipped = errors = 0
+            for result in results:
+                for level, message in result.messages:
+                    logger.log(level, message)
+                skipped += result.skipped
+                self.skipped += result.skipped
+                errors += result.errors
+                rows = result.rows
+                for start in range(0, len(rows), self.chunk_size):
+                    yield rows[start : start + self.chunk_size]
+
+        if skipped or errors:
+            logger.warning(
+                f"Parsed {source.name} in parallel: {skipped} records "
+                f"skipped, {errors} lines with errors"
+            )
+
+    def _iter_line_chunks(
+        self,
+        mm: mmap.mmap,
+        start: int = 0,
+        end: int | None = None,
+        first_line: int = 1,
+    ) -> Iterator[list[dict]]:
+        """
+        Scan a mapped JSON lines buffer and yield parsed chunks.
+
+        Only bytes in [start, end) are read; the line at start is numbered
+        first_line in warnings.
+        """
         chunk: list[dict] = []
         line_count = 0
         error_count = 0
 
-        for line_num, line in enumerate(file, 1):
-            line = line.strip()
+        size = len(mm) if end is None else end
+        pos = start
+        line_num = first_line - 1
+        while pos < size:
+            nl = mm.find(b"\n", pos)
+            if nl == -1:
+                nl = size
+            line = mm[pos:nl].strip()
+            pos = nl + 1
+            line_num += 1
             if not line:
                 continue
 
             if len(line) > self.MAX_RECORD_SIZE:
-                logger.warning(f"Line {line_num} exceeds max size, skipping")
+                self._report(
+                    logging.WARNING,
+                    f"Line {line_num} exceeds max size, skipping",
+                )
                 error_count += 1
                 continue
 
-            try:
-                if isinstance(line, bytes):
-                    item = orjson.loads(line)
-                else:
-                    item = orjson.loads(line.encode("utf-8"))
-
-                if not isinstance(item, dict):
-                    logger.warning(
-                        f"Line {line_num} is not a JSON object, skipping"
-                    )
-                    error_count += 1
-                    continue
-
-                chunk.append(item)
-                line_count += 1
-
-                if len(chunk) >= self.chunk_size:
-                    yield from self._process_chunk_safe(chunk)
-                    chunk = []
+            if not (line.startswith(b"{") and line.endswith(b"}")):
+                self._report(
+                    logging.WARNING,
+                    f"Line {line_num} is not a JSON object, skipping",
+                )
+                error_count += 1
+                continue
 
+            try:
+                item = orjson.loads(line)
             except orjson.JSONDecodeError as e:
-                logger.warning(f"Failed to parse line {line_num}: {e}")
+                self._report(
+                    logging.WARNING, f"Failed to parse line {line_num}: {e}"
+                )
                 error_count += 1
                 continue
             except (UnicodeError, ValueError) as e:
-                logger.warning(f"Encoding error on line {line_num}: {e}")
+                self._report(
+                    logging.WARNING, f"Encoding error on line {line_num}: {e}"
+                )
                 error_count += 1
                 continue
 
+            chunk.append(item)
+            line_count += 1
+
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+
         if chunk:
-            yield from self._process_chunk_safe(chunk)
+            yield chunk
 
+        self._line_errors += error_count
         if error_count > 0:
-            logger.warning(
-                f"Processed {line_count} lines with {error_count} errors"
+            self._report(
+                logging.WARNING,
+                f"Processed {line_count} lines with {error_count} errors",
             )
 
-    def _process_chunk_safe(self, chunk: list[dict]) -> Iterator[Client]:
-        """Process a chunk of JSON objects with size validation."""
+    def _process_chunk_safe(self, chunk: list[dict]) -> list[ClientRow]:
+        """
+        Process a chunk of JSON objects into validated client rows.
+
+        The client ID is checked first so records without one are dropped
+        before any other field is touched. Age and net worth are then
+        coerced per record and bounds-checked for the whole chunk at once;
+        gender is parsed only for records that pass.
+        """
+        records: list[dict] = []
+        client_ids: list[UUID] = []
+        malformed = 0
         for item in chunk:
+            if not isinstance(item, dict):
+                malformed += 1
+                continue
+            client_id = self._parse_uuid(item.get("id"))
+            if client_id is None:
+                continue
+            records.append(item)
+            client_ids.append(client_id)
+
+        if len(records) < len(chunk):
+            self._report(
+                logging.DEBUG,
+                f"Skipping {len(chunk) - len(records)} records without "
+                "valid client ID",
+            )
+
+        ages = np.fromiter(
+            (self._parse_age(r.get("age")) for r in records),
+            dtype=np.float64,
+            count=len(records),
+        )
+        net_worths = np.fromiter(
+            (self._parse_net_worth(r.get("net_worth")) for r in records),
+            dtype=np.float64,
+            count=len(records),
+        )
+        valid = (
+            (ages == np.floor(ages))
+            & (ages >= 0)
+            & (ages <= 150)
+            & (net_worths >= 0)
+            & (net_worths <= 1e12)
+        )
+
+        invalid_count = len(records) - int(np.count_nonzero(valid))
+        if invalid_count:
+            self._report(
+                logging.DEBUG,
+                f"Skipping {invalid_count} clients - missing or out of range "
+                "age/net worth",
+            )
+
+        rows: list[ClientRow] = []
+        for idx in np.flatnonzero(valid):
             try:
-                client = self._dict_to_client(item)
-                if client:
-                    yield client
+                row = self._dict_to_row(
+                    records[idx],
+                    client_id=client_ids[idx],
+                    age=int(ages[idx]),
+                    net_worth=float(net_worths[idx]),
+                )
+                if row:
+                    rows.append(row)
             except Exception as e:
-                logger.warning(f"Failed to process record: {e}")
+                self._report(logging.WARNING, f"Failed to process record: {e}")
                 continue
 
-    def _dict_to_client(self, data: dict) -> Client | None:
+        # Non-object entries are malformed input, not rejected clients.
+        self.skipped += len(chunk) - malformed - len(rows)
+        return rows
+
+    def _dict_to_row(
+        self, data: dict, client_id: UUID, age: int, net_worth: float
+    ) -> ClientRow | None:
         """
-        Convert JSON dict to Client entity with security checks.
+        Convert JSON dict to a client row with security checks.
+
+        ID, age and net worth arrive already validated by
+        _process_chunk_safe; only gender is parsed here.
 
         Handles:
-        - Missing/null ID -> skip client
-        - Age as float -> convert to int
         - Gender string -> enum mapping
-        - Net worth with comma/scientific notation
         - Prevents injection attacks
         """
         try:
-            if not isinstance(data, dict):
-                logger.debug("Skipping non-dict record")
-                return None
-
-            client_id = self._parse_uuid(data.get("id"))
-            if not client_id:
-                logger.debug("Skipping client without valid ID")
-                return None
-
-            age = self._parse_age(data.get("age"))
-
             gender = self._parse_gender(data.get("gender"))
 
-            net_worth = self._parse_net_worth(data.get("net_worth"))
-
-            if age is None or net_worth is None:
-                logger.debug(
-                    f"Skipping client {client_id} - missing required data"
-                )
-                return None
-
-            return Client(
-                id=client_id,
-                age=age,
-                gender=gender,
-                net_worth=net_worth,
-            )
+            return {
+                "id": str(client_id),
+                "age": age,
+                "gender": gender.value,
+                "net_worth": round(net_worth, 2),
+            }
 
         except Exception as e:
-            logger.warning(f"Failed to parse client: {e}")
+            self._report(logging.WARNING, f"Failed to parse client: {e}")
             return None
 
     def _parse_uuid(self, value: Any) -> UUID | None:
@@ -242,9 +554,9 @@ class ClientJsonLoader(JsonLoader[Client]):
         if value is None:
             return None
 
-        if isinstance(value, str):
+        if type(value) is str:
             value = value.strip()
-            if value.lower() in ("null", "none", ""):
+            if len(value) <= 4 and value.lower() in _NULL_SENTINELS:
                 return None
 
         try:
@@ -256,35 +568,14 @@ class ClientJsonLoader(JsonLoader[Client]):
         except (ValueError, AttributeError, TypeError):
             return None
 
-    def _parse_age(self, value: Any) -> int | None:
-        """Parse age with validation and bounds checking."""
-        if value is None:
-            return None
-
-        try:
-            if isinstance(value, (int, float)):
-                age_float = float(value)
-            elif isinstance(value, str):
-                value = value.strip()
-                if value.lower() in ("null", "none", ""):
-                    return None
-                age_float = float(value)
-            else:
-                return None
-
-            if not age_float.is_integer():
-                return None
-
-            age = int(age_float)
-
-            if not (0 <= age <= 150):
-                logger.debug(f"Age out of valid range: {age}")
-                return None
-
-            return age
+    def _parse_age(self, value: Any) -> float:
+        """
+        Coerce age to float.
 
-        except (ValueError, TypeError):
-            return None
+        Returns NaN for missing or malformed values; bounds are checked
+        per chunk in _process_chunk_safe.
+        """
+        return self._AGE_PARSERS.get(type(value), _to_nan)(value)
 
     def _parse_gender(self, value: Any) -> Gender:
         """Parse gender string to enum with sanitization."""
@@ -292,7 +583,7 @@ class ClientJsonLoader(JsonLoader[Client]):
             return Gender.UNKNOWN
 
         try:
-            if isinstance(value, str):
+            if type(value) is str:
                 str_value = value.strip()
                 if len(str_value) > 50:
                     return Gender.UNKNOWN
@@ -301,50 +592,49 @@ class ClientJsonLoader(JsonLoader[Client]):
         except (ValueError, TypeError):
             return Gender.UNKNOWN
 
-        gender_map = {
-            "Мужчина": Gender.MALE,
-            "Женщина": Gender.FEMALE,
-            "Другой": Gender.OTHER,
-        }
-
-        return gender_map.get(str_value, Gender.UNKNOWN)
+        return self.GENDER_MAP.get(str_value, Gender.UNKNOWN)
 
-    def _parse_net_worth(self, value: Any) -> float | None:
-        """Parse net worth with validation and bounds checking."""
-        if value is None:
-            return None
-
-        try:
-            if isinstance(value, (int, float)):
-                net_worth = float(value)
-            elif isinstance(value, str):
-                str_value = value.strip()
-                if str_value.lower() in ("null", "none", ""):
-                    return None
-
-                str_value = str_value.replace(" ", "")
-
-                if "," in str_value and "." not in str_value:
-                    str_value = str_value.replace(",", ".")
+    def _parse_net_worth(self, value: Any) -> float:
+        """
+        Coerce net worth to float.
 
-                if "e" in str_value.lower():
-                    str_value = str_value.lower()
+        Returns NaN for missing or malformed values; bounds are checked
+        per chunk in _process_chunk_safe.
+        """
+        return self._NET_WORTH_PARSERS.get(type(value), _to_nan)(value)
 
-                net_worth = float(str_value)
-            else:
-                return None
 
-            if net_worth < 0:
-                logger.debug(f"Negative net worth: {net_worth}")
-                return None
+def _count_newlines(
+    mm: mmap.mmap, start: int, end: int, block_size: int = 1 << 20
+) -> int:
+    """Count newlines in mm[start:end], copying one block at a time."""
+    return sum(
+        mm[pos : min(pos + block_size, end)].count(b"\n")
+        for pos in range(start, end, block_size)
+    )
 
-            if net_worth > 1e12:
-                logger.debug(
-                    f"Net worth exceeds reasonable limit: {net_worth}"
-                )
-                return None
 
-            return net_worth
+def _parse_range(
+    path_str: str, start: int, end: int, chunk_size: int, first_line: int
+) -> RangeResult:
+    """
+    Parse one byte range of a JSON lines file in a worker process.
 
-        except (ValueError, TypeError):
-            return None
+    Diagnostics are returned rather than logged, so the parent can emit
+    them through its own logging setup.
+    """
+    loader = ClientJsonLoader(chunk_size=chunk_size, workers=1)
+    loader._reports = []
+    rows: list[ClientRow] = []
+    with (
+        open(path_str, "rb") as f,
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+    ):
+        for chunk in loader._iter_line_chunks(mm, start, end, first_line):
+            rows.extend(loader._process_chunk_safe(chunk))
+    return RangeResult(
+        rows=rows,
+        skipped=loader.skipped,
+        errors=loader._line_errors,
+        messages=loader._reports,
+    )
@@ -5,18 +5,26 @@ These models represent the cleaned and normalized data structure.
 """
 
 from datetime import datetime
+from typing import Any
 
 import inflection
+import orjson
 from sqlalchemy import (
-    JSON,
+    Computed,
     DateTime,
     Float,
     ForeignKey,
     Index,
     Integer,
+    LargeBinary,
     String,
+    TypeDecorator,
     func,
+    literal_column,
+    text,
 )
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.engine import Dialect
 from sqlalchemy.orm import (
     DeclarativeBase,
     Mapped,
@@ -26,6 +34,34 @@ from sqlalchemy.orm import (
 )
 
 
+class OrjsonBlob(TypeDecorator):
+    """
+    JSON document stored as orjson-encoded bytes in a BLOB column.
+
+    Values are encoded straight to UTF-8 bytes and parsed from the
+    buffer SQLite returns, with no intermediate Python str.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect: Dialect) -> Any:
+        if value is None:
+            return None
+        return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+    def process_result_value(self, value: Any, dialect: Dialect) -> Any:
+        if value is None:
+            return None
+        return orjson.loads(value)
+
+
+# Binary JSONB storage on PostgreSQL, orjson bytes elsewhere (SQLite).
+JsonDocument = OrjsonBlob().with_variant(
+    JSONB(none_as_null=True), "postgresql"
+)
+
+
 class Base(DeclarativeBase):
     """Base class for all SQLAlchemy models."""
 
@@ -43,40 +79,68 @@ class Base(DeclarativeBase):
         return f"<{self.__class__.__name__}({', '.join(attrs)})>"
 
 
+class IdMapTable(Base):
+    """
+    Dictionary encoding of external string ids (UUIDs) to integers.
+
+    Client and transaction tables key on the integer surrogate, so joins
+    and index lookups compare 64-bit integers instead of 36-byte text.
+    """
+
+    int_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    str_id: Mapped[str] = mapped_column(
+        String(36), nullable=False, unique=True
+    )
+
+
 class ClientTable(Base):
     """ORM model for clients data."""
 
-    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    id: Mapped[int] = mapped_column(
+        Integer, primary_key=True, autoincrement=False
+    )
     age: Mapped[int] = mapped_column(Integer, nullable=True)
     gender: Mapped[str] = mapped_column(String(20), nullable=True)
     net_worth: Mapped[float] = mapped_column(Float, nullable=True)
+    segment: Mapped[str] = mapped_column(
+        String(50),
+        Computed(
+            "CASE"
+            " WHEN net_worth < 100000 THEN 'Низкий капитал'"
+            " WHEN net_worth BETWEEN 100000 AND 1000000"
+            " THEN 'Средний капитал'"
+            " WHEN net_worth > 1000000 THEN 'Высокий капитал'"
+            " ELSE 'Неизвестно' END",
+            persisted=True,
+        ),
+    )
 
-    transactions = relationship("TransactionTable", back_populates="client")
+    transactions = relationship(
+        "TransactionTable", back_populates="client", lazy="selectin"
+    )
 
     __table_args__ = (
         Index("ix_clients_net_worth", "net_worth"),
         Index("ix_clients_age", "age"),
+        Index("ix_clients_segment", "segment"),
     )
 
 
 class TransactionTable(Base):
     """ORM model for transactions data."""
 
-    id: Mapped[str] = mapped_column(String(36), primary_key=True)
-    client_id: Mapped[str] = mapped_column(
-        String(36),
+    id: Mapped[int] = mapped_column(
+        Integer, primary_key=True, autoincrement=False
+    )
+    client_id: Mapped[int] = mapped_column(
+        Integer,
         ForeignKey(f"{ClientTable.__tablename__}.id", ondelete="SET NULL"),
         nullable=True,
-        index=True,
-    )
-    raw_service: Mapped[str] = mapped_column(
-        String(100), nullable=False, index=True
     )
+    raw_service: Mapped[str] = mapped_column(String(100), nullable=False)
     raw_payment_method: Mapped[str] = mapped_column(String(50), nullable=False)
 
-    transaction_date: Mapped[datetime] = mapped_column(
-        DateTime, nullable=True, index=True
-    )
+    transaction_date: Mapped[datetime] = mapped_column(DateTime, nullable=True)
     amount: Mapped[float] = mapped_column(Float, nullable=False)
     city: Mapped[str] = mapped_column(String(100), nullable=True)
     consultant: Mapped[str] = mapped_column(String(100), nullable=True)
@@ -88,14 +152,33 @@ class TransactionTable(Base):
         String(50), nullable=False
     )
 
+    # Copied from the client after loading so segment analyses need no join.
+    client_net_worth: Mapped[float] = mapped_column(Float, nullable=True)
+    client_segment: Mapped[str] = mapped_column(String(50), nullable=True)
+
     client = relationship("ClientTable", back_populates="transactions")
 
     __table_args__ = (
         Index("ix_transactions_date_amount", "transaction_date", "amount"),
         Index("ix_transactions_client_date", "client_id", "transaction_date"),
+        Index("ix_transactions_client_amount", "client_id", "amount"),
+        Index("ix_transactions_service_amount", "raw_service", "amount"),
+        Index("ix_transactions_city_amount", "city", "amount"),
+        Index("ix_transactions_payment_method", "raw_payment_method"),
+        Index("ix_transactions_segment_amount", "client_segment", "amount"),
+        Index(
+            "ix_transactions_month",
+            text("strftime('%Y-%m', transaction_date)"),
+        ),
     )
 
 
+transaction_month = func.strftime(
+    literal_column("'%Y-%m'"), TransactionTable.transaction_date
+)
+"""Year-month ("YYYY-MM") of a transaction, matching ix_transactions_month."""
+
+
 class AnalysisResultTable(Base):
     """Store analysis results for quick access."""
 
@@ -105,13 +188,15 @@ class AnalysisResultTable(Base):
     analysis_name: Mapped[str] = mapped_column(
         String(100), nullable=False, index=True
     )
-    result_json: Mapped[dict] = mapped_column(JSON, nullable=False)
+    result_json: Mapped[dict] = mapped_column(JsonDocument, nullable=False)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
         nullable=False,
     )
-    parameters: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    parameters: Mapped[dict | None] = mapped_column(
+        JsonDocument, nullable=True
+    )
 
     __table_args__ = (
         Index(
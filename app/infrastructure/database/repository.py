@@ -4,20 +4,246 @@ Repository pattern for database access.
 Separates business logic from data access logic.
 """
 
-from datetime import datetime, timedelta
-from sqlite3 import IntegrityError
-from typing import Any, TypedDict
-
-from sqlalchemy import and_, case, desc, func
+from collections import OrderedDict
+from collections.abc import (
+    Callable,
+    Hashable,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+)
+from datetime import datetime
+from functools import wraps
+from itertools import chain, islice
+from operator import attrgetter, itemgetter
+from threading import Lock
+from typing import Any, ClassVar, TypedDict, TypeVar
+from weakref import WeakKeyDictionary
+
+import numpy as np
+import orjson
+from sqlalchemy import (
+    ColumnElement,
+    Connection,
+    DateTime,
+    Engine,
+    LargeBinary,
+    bindparam,
+    case,
+    desc,
+    event,
+    func,
+    insert,
+    literal,
+    null,
+    select,
+    type_coerce,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.sqlite import Insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Dialect
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from structlog import get_logger
 
-from app.domain.entities import Client, Transaction
-
-from .models import AnalysisResultTable, ClientTable, TransactionTable
+from app.domain.entities import (
+    Client,
+    FinanceServiceType,
+    PaymentMethod,
+    Transaction,
+)
+
+from .models import (
+    AnalysisResultTable,
+    Base,
+    ClientTable,
+    IdMapTable,
+    OrjsonBlob,
+    TransactionTable,
+    transaction_month,
+)
 
 logger = get_logger(__name__)
 
+T = TypeVar("T")
+
+
+def _upsert_statement(table: type[Base]) -> Insert:
+    """
+    Build an INSERT ... ON CONFLICT(id) DO UPDATE statement for a table.
+
+    Executed with a list of row dicts it becomes a single prepared
+    executemany, replacing per-row session.merge() calls.
+    """
+    stmt = sqlite_insert(table)
+    return stmt.on_conflict_do_update(
+        index_elements=["id"],
+        set_={
+            column.name: stmt.excluded[column.name]
+            for column in table.__table__.columns
+            if not column.primary_key and column.computed is None
+        },
+    )
+
+
+class QueryCache:
+    """
+    Generation-stamped cache for read-only aggregate query results.
+
+    One cache exists per engine. Entries are keyed by the current
+    generation, so bumping it on every write makes older results
+    unreachable. Results are stored as orjson bytes, which keeps them
+    compact and hands every caller its own copy. All operations take a
+    lock, since sessions on other threads share the cache.
+    """
+
+    MAX_ENTRIES: ClassVar[int] = 256
+
+    _instances: ClassVar[WeakKeyDictionary[Engine, "QueryCache"]] = (
+        WeakKeyDictionary()
+    )
+    _instances_lock: ClassVar[Lock] = Lock()
+
+    def __init__(self) -> None:
+        self.generation = 0
+        self._entries: OrderedDict[Hashable, bytes] = OrderedDict()
+        self._lock = Lock()
+
+    @classmethod
+    def for_engine(cls, engine: Engine | Connection) -> "QueryCache":
+        """Get the cache shared by all sessions bound to an engine."""
+        if isinstance(engine, Connection):
+            engine = engine.engine
+        with cls._instances_lock:
+            cache = cls._instances.get(engine)
+            if cache is None:
+                cache = cls._instances[engine] = cls()
+        return cache
+
+    def get(self, key: Hashable) -> bytes | None:
+        """Get a cached result and mark it as recently used."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: bytes) -> None:
+        """Store a result, evicting the least recently used one if full."""
+        with self._lock:
+            self._entries[key] = value
+            if len(self._entries) > self.MAX_ENTRIES:
+                self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        """Start a new generation and drop all cached results."""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+
+# Set in Session.info by repository writes until the transaction ends.
+_PENDING_WRITES = "query_cache_pending_writes"
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _invalidate_after_write(session: Session) -> None:
+    """
+    Start a new cache generation when a transaction that wrote ends.
+
+    Results cached by other sessions while the write was uncommitted
+    describe the old data once it commits.
+    """
+    if session.info.pop(_PENDING_WRITES, False):
+        QueryCache.for_engine(session.get_bind()).invalidate()
+
+
+def cached(method: Callable[..., T]) -> Callable[..., T]:
+    """
+    Cache a read-only repository method in the engine's QueryCache.
+
+    The key is (generation, method name, orjson-encoded arguments).
+    Sessions with uncommitted writes bypass the cache, so results that
+    may still be rolled back are never shared.
+    """
+
+    @wraps(method)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> T:
+        if self.session.info.get(_PENDING_WRITES):
+            return method(self, *args, **kwargs)
+
+        cache = self.query_cache
+        key = (
+            cache.generation,
+            method.__name__,
+            orjson.dumps([args, kwargs]),
+        )
+        hit = cache.get(key)
+        if hit is not None:
+            return orjson.loads(hit)
+
+        result = method(self, *args, **kwargs)
+        cache.put(key, orjson.dumps(result))
+        return result
+
+    return wrapper
+
+
+class IdDict:
+    """
+    Dictionary-encode external string ids into integer surrogates.
+
+    The mapping is persisted in IdMapTable, so a given UUID always gets
+    the same integer (whether first seen as a transaction's client_id or
+    as a client's id). Ids already resolved are kept in a local dict.
+    """
+
+    LOOKUP_BATCH_SIZE: ClassVar[int] = 500
+
+    def __init__(self, session: Session):
+        self.session = session
+        self._ids: dict[str, int] = {}
+
+    def encode_many(self, str_ids: Iterable[str]) -> Mapping[str, int]:
+        """
+        Resolve string ids, allocating integers for unseen ones.
+
+        Args:
+            str_ids: External ids to encode
+
+        Returns:
+            Mapping covering (at least) every id in str_ids
+        """
+        known = self._ids
+        missing = list(dict.fromkeys(i for i in str_ids if i not in known))
+        if not missing:
+            return known
+
+        self.session.execute(
+            sqlite_insert(IdMapTable).on_conflict_do_nothing(
+                index_elements=["str_id"]
+            ),
+            [{"str_id": str_id} for str_id in missing],
+        )
+        for start in range(0, len(missing), self.LOOKUP_BATCH_SIZE):
+            batch = missing[start : start + self.LOOKUP_BATCH_SIZE]
+            known.update(
+                self.session.execute(
+                    select(IdMapTable.str_id, IdMapTable.int_id).where(
+                        IdMapTable.str_id.in_(batch)
+                    )
+                ).all()
+            )
+        return known
+
+    def encode(self, str_id: str) -> int:
+        """Resolve a single string id."""
+        return self.encode_many((str_id,))[str_id]
+
 
 class LevelValues(TypedDict):
     """Net worth levels."""
@@ -37,11 +263,123 @@ class ClientSegmentAnalysis(TypedDict):
     client_count: int
 
 
+class DashboardBundle(TypedDict):
+    """Aggregates computed together by a single dashboard query."""
+
+    last_month_revenue: float
+    monthly_trend: list[dict[str, Any]]
+    service_performance: list[dict[str, Any]]
+
+
+_transaction_fields = attrgetter(
+    "id",
+    "client_id",
+    "raw_service",
+    "raw_payment_method",
+    "transaction_date",
+    "amount",
+    "city",
+    "consultant",
+)
+_SERVICE_CATEGORIES = frozenset(FinanceServiceType)
+_UNKNOWN_SERVICE = FinanceServiceType.UNKNOWN.value
+_PAYMENT_METHODS = frozenset(PaymentMethod)
+_UNKNOWN_PAYMENT_METHOD = PaymentMethod.UNKNOWN.value
+
+# Statements for the hot aggregate queries are built once at import;
+# per call only parameters are bound, and the engine's compiled cache
+# reuses the SQL string.
+_MAX_DATE_STMT = select(func.max(TransactionTable.transaction_date))
+
+_TOP_SERVICES_STMT = (
+    select(
+        TransactionTable.raw_service.label("service"),
+        func.count().label("order_count"),
+    )
+    .group_by(TransactionTable.raw_service)
+    .order_by(desc("order_count"))
+    .limit(bindparam("limit"))
+)
+
+_MAX_REVENUE_SERVICE_STMT = (
+    select(
+        TransactionTable.raw_service.label("service"),
+        func.sum(TransactionTable.amount).label("total_revenue"),
+    )
+    .group_by(TransactionTable.raw_service)
+    .order_by(desc("total_revenue"))
+    .limit(1)
+)
+
+_AVG_BY_CITY_STMT = (
+    select(
+        TransactionTable.city,
+        func.avg(TransactionTable.amount).label("avg_amount"),
+        func.count().label("transaction_count"),
+    )
+    .where(TransactionTable.city.isnot(None))
+    .group_by(TransactionTable.city)
+    .order_by(desc("avg_amount"))
+)
+
+_TRANSACTION_COUNT_STMT = select(func.count(TransactionTable.id))
+
+_PAYMENT_METHODS_STMT = (
+    select(
+        TransactionTable.raw_payment_method.label("method"),
+        (func.count() * 100.0 / bindparam("total")).label("percentage"),
+    )
+    .group_by(TransactionTable.raw_payment_method)
+    .order_by(desc("percentage"))
+)
+
+_MONTHLY_TREND_STMT = (
+    select(
+        transaction_month.label("period"),
+        func.sum(TransactionTable.amount).label("revenue"),
+        func.count().label("transaction_count"),
+    )
+    .where(
+        TransactionTable.transaction_date
+        >= bindparam("since_date", type_=DateTime)
+    )
+    .group_by(transaction_month)
+    .order_by(transaction_month)
+)
+
+_SERVICE_PERFORMANCE_STMT = (
+    select(
+        TransactionTable.raw_service.label("service"),
+        func.count().label("order_count"),
+        func.sum(TransactionTable.amount).label("total_revenue"),
+        func.avg(TransactionTable.amount).label("avg_amount"),
+        func.min(TransactionTable.amount).label("min_amount"),
+        func.max(TransactionTable.amount).label("max_amount"),
+    )
+    .group_by(TransactionTable.raw_service)
+    .order_by(desc("total_revenue"))
+)
+
+
 class TransactionRepository:
     """Repository for transaction operations."""
 
+    STREAM_BATCH_SIZE: ClassVar[int] = 1000
+    BULK_BATCH_SIZE: ClassVar[int] = 10_000
+
     def __init__(self, session: Session):
         self.session = session
+        self.ids = IdDict(session)
+
+    @property
+    def query_cache(self) -> QueryCache:
+        """Result cache shared by repositories on the same engine."""
+        return QueryCache.for_engine(self.session.get_bind())
+
+    def _invalidate_cache(self) -> None:
+        """Drop cached aggregates now and again when this transaction ends."""
+        self.session.info[_PENDING_WRITES] = True
+        self.query_cache.invalidate()
 
     def add(self, transaction: Transaction) -> None:
         """
@@ -54,40 +392,118 @@ class TransactionRepository:
             logger.debug("Skipping transaction without ID")
             return
 
-        transaction_id = str(transaction.id)
-
-        orm_obj = TransactionTable(
-            id=transaction_id,
-            client_id=(
-                str(transaction.client_id) if transaction.client_id else None
-            ),
-            raw_service=transaction.raw_service,
-            raw_payment_method=transaction.raw_payment_method,
-            transaction_date=transaction.transaction_date,
-            amount=transaction.amount,
-            city=transaction.city,
-            consultant=transaction.consultant,
-            service_category=transaction.service_category.value,
-            payment_method_category=(
-                transaction.payment_method_category.value or "UNKNOWN"
-            ),
-        )
-
-        self.session.merge(orm_obj)
+        row = self._to_row(transaction)
+        self._encode_ids([row])
+        self.session.merge(TransactionTable(**row))
+        self._invalidate_cache()
 
-    def add_many(self, transactions: list[Transaction]) -> None:
-        """Bulk insert multiple transactions"""
+    def add_many(self, transactions: Iterable[Transaction]) -> None:
+        """
+        Bulk upsert transactions with one executemany per batch.
 
-        for transaction in transactions:
-            self.add(transaction)
+        The input is consumed lazily in batches of BULK_BATCH_SIZE, so an
+        iterator of any length never materializes as a full row list.
+        Within a batch rows are deduplicated by transaction ID (last one
+        wins); repeats across batches are resolved by the upsert. All
+        batches run in the caller's transaction.
 
+        Args:
+            transactions: Domain transaction entities
+        """
+        rows = self._iter_rows(transactions)
+        stmt = _upsert_statement(TransactionTable)
         try:
-            self.session.flush()
+            while batch := list(islice(rows, self.BULK_BATCH_SIZE)):
+                unique = list({row["id"]: row for row in batch}.values())
+                self._encode_ids(unique)
+                self.session.execute(stmt, unique)
         except IntegrityError as e:
             logger.error(f"Integrity error during bulk insert: {e}")
             self.session.rollback()
             raise
+        finally:
+            self._invalidate_cache()
+
+    def _iter_rows(
+        self, transactions: Iterable[Transaction]
+    ) -> Iterator[dict[str, Any]]:
+        """Map transactions to rows, skipping those without an ID."""
+        to_row = self._to_row
+        for transaction in transactions:
+            if not transaction.id:
+                logger.debug("Skipping transaction without ID")
+                continue
+            yield to_row(transaction)
+
+    def sync_client_attributes(self) -> None:
+        """
+        Copy client net worth and segment onto their transactions.
+
+        Run after clients are loaded (they arrive after transactions).
+        Transactions without a matching client keep NULLs.
+        """
+        self.session.execute(
+            update(TransactionTable)
+            .where(TransactionTable.client_id == ClientTable.id)
+            .values(
+                client_net_worth=ClientTable.net_worth,
+                client_segment=ClientTable.segment,
+            )
+        )
+        self._invalidate_cache()
+
+    def _encode_ids(self, rows: list[dict[str, Any]]) -> None:
+        """Replace string id/client_id values with integer surrogates."""
+        ids = self.ids.encode_many(
+            chain(
+                (row["id"] for row in rows),
+                (row["client_id"] for row in rows if row["client_id"]),
+            )
+        )
+        for row in rows:
+            row["id"] = ids[row["id"]]
+            if row["client_id"]:
+                row["client_id"] = ids[row["client_id"]]
 
+    @staticmethod
+    def _to_row(transaction: Transaction) -> dict[str, Any]:
+        """
+        Map a transaction entity to TransactionTable column values.
+
+        Fields are read with one C-level attrgetter call, and categories
+        are resolved from the raw strings by set lookup instead of
+        constructing enums through the computed properties.
+        """
+        (
+            transaction_id,
+            client_id,
+            service,
+            payment_method,
+            transaction_date,
+            amount,
+            city,
+            consultant,
+        ) = _transaction_fields(transaction)
+        return {
+            "id": str(transaction_id),
+            "client_id": str(client_id) if client_id else None,
+            "raw_service": service,
+            "raw_payment_method": payment_method,
+            "transaction_date": transaction_date,
+            "amount": amount,
+            "city": city,
+            "consultant": consultant,
+            "service_category": (
+                service if service in _SERVICE_CATEGORIES else _UNKNOWN_SERVICE
+            ),
+            "payment_method_category": (
+                payment_method
+                if payment_method in _PAYMENT_METHODS
+                else _UNKNOWN_PAYMENT_METHOD
+            ),
+        }
+
+    @cached
     def get_top_services_by_count(
         self, limit: int = 5
     ) -> list[dict[str, Any]]:
@@ -100,20 +516,14 @@ class TransactionRepository:
         Returns:
             List of dicts with service name and order count
         """
-        result = (
-            self.session
-            .query(
-                TransactionTable.raw_service.label("service"),
-                func.count().label("order_count"),
-            )
-            .group_by(TransactionTable.raw_service)
-            .order_by(desc("order_count"))
-            .limit(limit)
-            .all()
-        )
+        result = self.session.execute(_TOP_SERVICES_STMT, {"limit": limit})
 
-        return [{"service": r.service, "count": r.order_count} for r in result]
+        return [
+            {"service": service, "count": order_count}
+            for service, order_count in result
+        ]
 
+    @cached
     def get_service_with_max_revenue(self) -> dict[str, Any] | None:
         """
         Find service with highest total revenue.
@@ -121,21 +531,13 @@ class TransactionRepository:
         Returns:
             Dict with service name and total revenue, or None if no data
         """
-        result = (
-            self.session
-            .query(
-                TransactionTable.raw_service.label("service"),
-                func.sum(TransactionTable.amount).label("total_revenue"),
-            )
-            .group_by(TransactionTable.raw_service)
-            .order_by(desc("total_revenue"))
-            .first()
-        )
+        result = self.session.execute(_MAX_REVENUE_SERVICE_STMT).first()
 
         if result:
             return {"service": result.service, "revenue": result.total_revenue}
         return None
 
+    @cached
     def get_avg_amount_by_city(self) -> list[dict[str, Any]]:
         """
         Calculate average transaction amount per city.
@@ -143,28 +545,18 @@ class TransactionRepository:
         Returns:
             List of dicts with city and average amount
         """
-        result = (
-            self.session
-            .query(
-                TransactionTable.city,
-                func.avg(TransactionTable.amount).label("avg_amount"),
-                func.count().label("transaction_count"),
-            )
-            .filter(TransactionTable.city.isnot(None))
-            .group_by(TransactionTable.city)
-            .order_by(desc("avg_amount"))
-            .all()
-        )
+        result = self.session.execute(_AVG_BY_CITY_STMT)
 
         return [
             {
-                "city": r.city,
-                "avg_amount": round(r.avg_amount, 2),
-                "count": r.transaction_count,
+                "city": city,
+                "avg_amount": round(avg_amount, 2),
+                "count": transaction_count,
             }
-            for r in result
+            for city, avg_amount, transaction_count in result
         ]
 
+    @cached
     def get_payment_method_distribution(self) -> dict[str, float]:
         """
         Calculate percentage distribution of payment methods.
@@ -172,66 +564,58 @@ class TransactionRepository:
         Returns:
             Dict with payment method as key and percentage as value
         """
-        total = self.session.query(func.count(TransactionTable.id)).scalar()
+        total = self.session.scalar(_TRANSACTION_COUNT_STMT)
         if not total:
             return {}
 
-        result = (
-            self.session
-            .query(
-                TransactionTable.raw_payment_method.label("method"),
-                (func.count() * 100.0 / total).label("percentage"),
-            )
-            .group_by(TransactionTable.raw_payment_method)
-            .order_by(desc("percentage"))
-            .all()
-        )
+        result = self.session.execute(_PAYMENT_METHODS_STMT, {"total": total})
 
-        return {r.method: round(r.percentage, 2) for r in result}
+        return {
+            method: round(float(percentage), 2)
+            for method, percentage in result
+        }
 
     def get_last_month_revenue(self) -> float:
         """
         Calculate total revenue for the last month in the data.
-        """
-        max_date = self.session.query(
-            func.max(TransactionTable.transaction_date)
-        ).scalar()
-
-        if not max_date:
-            return 0.0
 
-        if max_date.month == 1:
-            last_month_start = datetime(max_date.year - 1, 12, 1)
-        else:
-            last_month_start = datetime(max_date.year, max_date.month - 1, 1)
-
-        last_month_end = datetime(
-            max_date.year, max_date.month, 1
-        ) - timedelta(days=1)
-
-        result = (
-            self.session
-            .query(func.sum(TransactionTable.amount))
-            .filter(
-                and_(
-                    TransactionTable.transaction_date >= last_month_start,
-                    TransactionTable.transaction_date <= last_month_end,
-                )
+        The last month is the calendar month before the one holding the
+        latest transaction, the same window get_dashboard_bundle uses.
+        """
+        month_start = func.datetime(
+            _MAX_DATE_STMT.scalar_subquery(), "start of month"
+        )
+        result = self.session.scalar(
+            select(func.sum(TransactionTable.amount)).where(
+                *self._last_month_window(month_start)
             )
-            .scalar()
         )
 
         return result or 0.0
 
+    @staticmethod
+    def _last_month_window(
+        month_start: ColumnElement[Any],
+    ) -> tuple[ColumnElement[bool], ColumnElement[bool]]:
+        """
+        Filter transactions to the full calendar month before month_start.
+
+        The upper bound is exclusive, so the whole last day is included.
+        """
+        return (
+            TransactionTable.transaction_date
+            >= func.datetime(month_start, "-1 month"),
+            TransactionTable.transaction_date < month_start,
+        )
+
+    @cached
     def get_monthly_revenue_trend(
         self, months: int = 6
     ) -> list[dict[str, Any]]:
         """
         Get monthly revenue trend for the last N months of data.
         """
-        max_date = self.session.query(
-            func.max(TransactionTable.transaction_date)
-        ).scalar()
+        max_date = self.session.scalar(_MAX_DATE_STMT)
 
         if not max_date:
             return []
@@ -243,35 +627,14 @@ class TransactionRepository:
                 max_date.year - 1, 12 - (months - max_date.month), 1
             )
 
-        year = func.strftime("%Y", TransactionTable.transaction_date)
-        month = func.strftime("%m", TransactionTable.transaction_date)
-
-        result = (
-            self.session
-            .query(
-                year.label("year"),
-                month.label("month"),
-                func.sum(TransactionTable.amount).label("revenue"),
-                func.count().label("transaction_count"),
-            )
-            .filter(TransactionTable.transaction_date >= since_date)
-            .group_by(year, month)
-            .order_by(year, month)
-            .all()
+        result = self.session.execute(
+            _MONTHLY_TREND_STMT, {"since_date": since_date}
         )
 
-        monthly_data = []
-        for r in result:
-            monthly_data.append({
-                "year": r.year,
-                "month": r.month,
-                "period": f"{r.year}-{r.month}",
-                "revenue": float(r.revenue) if r.revenue else 0.0,
-                "transaction_count": r.transaction_count or 0,
-            })
-
-        return monthly_data
+        month_row = self._month_row
+        return [month_row(*row) for row in result]
 
+    @cached
     def get_service_performance(self) -> list[dict[str, Any]]:
         """
         Comprehensive service performance analysis.
@@ -279,53 +642,170 @@ class TransactionRepository:
         Returns:
             List of services with revenue, count, avg, min, max.
         """
-        result = (
-            self.session
-            .query(
-                TransactionTable.raw_service.label("service"),
-                func.count().label("order_count"),
-                func.sum(TransactionTable.amount).label("total_revenue"),
-                func.avg(TransactionTable.amount).label("avg_amount"),
-                func.min(TransactionTable.amount).label("min_amount"),
-                func.max(TransactionTable.amount).label("max_amount"),
+        return list(self.iter_service_performance())
+
+    def iter_service_performance(self) -> Iterator[dict[str, Any]]:
+        """
+        Stream service performance rows as SQLite produces them.
+
+        Yields:
+            Dicts with service revenue, count, avg, min, max.
+        """
+        result = self.session.execute(
+            _SERVICE_PERFORMANCE_STMT,
+            execution_options={"yield_per": self.STREAM_BATCH_SIZE},
+        )
+        service_row = self._service_row
+        for row in result:
+            yield service_row(*row)
+
+    def get_dashboard_bundle(self, months: int = 12) -> DashboardBundle:
+        """
+        Compute last month revenue, monthly trend and service performance
+        in one round-trip.
+
+        The latest transaction date is computed once in a CTE and the
+        period boundaries are derived from it with SQLite date functions;
+        the three aggregates are tagged and combined with UNION ALL.
+
+        Args:
+            months: Number of months covered by the trend
+
+        Returns:
+            The three aggregates, shaped like the results of
+            get_last_month_revenue, get_monthly_revenue_trend and
+            get_service_performance.
+        """
+        tx = TransactionTable
+        max_date = select(func.max(tx.transaction_date).label("d")).cte("m")
+        month_start = func.datetime(max_date.c.d, "start of month")
+
+        last_month = select(
+            literal("last_month").label("kind"),
+            null().label("key"),
+            func.count().label("order_count"),
+            func.sum(tx.amount).label("total_revenue"),
+            null().label("avg_amount"),
+            null().label("min_amount"),
+            null().label("max_amount"),
+        ).where(*self._last_month_window(month_start))
+        monthly = (
+            select(
+                literal("month").label("kind"),
+                transaction_month.label("key"),
+                func.count(),
+                func.sum(tx.amount),
+                null(),
+                null(),
+                null(),
             )
-            .group_by(TransactionTable.raw_service)
-            .order_by(desc("total_revenue"))
-            .all()
+            .where(
+                tx.transaction_date
+                >= func.datetime(month_start, f"-{months} months")
+            )
+            .group_by(transaction_month)
         )
+        services = select(
+            literal("service").label("kind"),
+            tx.raw_service.label("key"),
+            func.count(),
+            func.sum(tx.amount),
+            func.avg(tx.amount),
+            func.min(tx.amount),
+            func.max(tx.amount),
+        ).group_by(tx.raw_service)
+
+        rows = self.session.execute(union_all(last_month, monthly, services))
+
+        bundle: DashboardBundle = {
+            "last_month_revenue": 0.0,
+            "monthly_trend": [],
+            "service_performance": [],
+        }
+        for kind, key, order_count, total_revenue, *stats in rows:
+            if kind == "service":
+                bundle["service_performance"].append(
+                    self._service_row(key, order_count, total_revenue, *stats)
+                )
+            elif kind == "month":
+                bundle["monthly_trend"].append(
+                    self._month_row(key, total_revenue, order_count)
+                )
+            else:
+                bundle["last_month_revenue"] = total_revenue or 0.0
 
-        return [
-            {
-                "service": r.service,
-                "order_count": r.order_count,
-                "total_revenue": r.total_revenue,
-                "avg_amount": round(r.avg_amount, 2),
-                "min_amount": r.min_amount,
-                "max_amount": r.max_amount,
-                "revenue_percentage": 0,
-            }
-            for r in result
-        ]
+        bundle["monthly_trend"].sort(key=itemgetter("period"))
+        bundle["service_performance"].sort(
+            key=itemgetter("total_revenue"), reverse=True
+        )
+        return bundle
+
+    @staticmethod
+    def _month_row(
+        period: str, revenue: float | None, transaction_count: int | None
+    ) -> dict[str, Any]:
+        """Shape one "YYYY-MM" aggregate row of the monthly trend."""
+        year, _, month = period.partition("-")
+        return {
+            "year": year,
+            "month": month,
+            "period": period,
+            "revenue": float(revenue) if revenue else 0.0,
+            "transaction_count": transaction_count or 0,
+        }
 
-    def enrich_with_percentages(self, services: list[dict]) -> list[dict]:
+    @staticmethod
+    def _service_row(
+        service: str,
+        order_count: int,
+        total_revenue: float,
+        avg_amount: float,
+        min_amount: float,
+        max_amount: float,
+    ) -> dict[str, Any]:
+        """Shape one per-service aggregate row."""
+        return {
+            "service": service,
+            "order_count": order_count,
+            "total_revenue": total_revenue,
+            "avg_amount": round(avg_amount, 2),
+            "min_amount": min_amount,
+            "max_amount": max_amount,
+            "revenue_percentage": 0,
+        }
+
+    def enrich_with_percentages(self, services: Iterable[dict]) -> list[dict]:
         """Add percentage columns to service analysis."""
+        services = list(services)
         if not services:
             return services
 
-        total_revenue = sum(s["total_revenue"] for s in services)
-        total_orders = sum(s["order_count"] for s in services)
+        count = len(services)
+        revenue = np.fromiter(
+            (s["total_revenue"] or 0 for s in services), np.float64, count
+        )
+        orders = np.fromiter(
+            (s["order_count"] for s in services), np.int64, count
+        )
+        total_revenue = revenue.sum()
+        total_orders = orders.sum()
+
+        revenue_pct = (
+            np.round(revenue / total_revenue * 100, 2).tolist()
+            if total_revenue
+            else [0] * count
+        )
+        order_pct = (
+            np.round(orders / total_orders * 100, 2).tolist()
+            if total_orders
+            else [0] * count
+        )
 
-        for service in services:
-            service["revenue_percentage"] = (
-                round((service["total_revenue"] / total_revenue * 100), 2)
-                if total_revenue
-                else 0
-            )
-            service["order_percentage"] = (
-                round((service["order_count"] / total_orders * 100), 2)
-                if total_orders
-                else 0
-            )
+        for service, rev_pct, ord_pct in zip(
+            services, revenue_pct, order_pct, strict=True
+        ):
+            service["revenue_percentage"] = rev_pct
+            service["order_percentage"] = ord_pct
 
         return services
 
@@ -335,6 +815,7 @@ class ClientRepository:
 
     def __init__(self, session: Session):
         self.session = session
+        self.ids = IdDict(session)
 
     def add(self, client: Client) -> None:
         """
@@ -347,17 +828,46 @@ class ClientRepository:
             return
 
         orm_obj = ClientTable(
-            id=str(client.id),
+            id=self.ids.encode(str(client.id)),
             age=client.age,
             gender=client.gender.value if client.gender else None,
             net_worth=client.net_worth,
         )
         self.session.merge(orm_obj)
 
-    def add_many(self, clients: list[Client]) -> None:
-        """Bulk insert multiple clients."""
-        for client in clients:
-            self.add(client)
+    def add_many(self, clients: Iterable[Client]) -> None:
+        """Bulk upsert multiple clients with a single executemany."""
+        self.add_rows([
+            {
+                "id": str(client.id),
+                "age": client.age,
+                "gender": client.gender.value if client.gender else None,
+                "net_worth": client.net_worth,
+            }
+            for client in clients
+            if client.id
+        ])
+
+    def add_rows(self, rows: Sequence[Mapping[str, Any]]) -> None:
+        """
+        Bulk upsert pre-validated client rows with a single executemany.
+
+        Bypasses the ORM unit of work; rows must use ClientTable column
+        names, with the external string id under "id" (it is encoded to
+        the integer surrogate here). Existing clients with the same id are
+        overwritten, matching the merge semantics of add().
+
+        Args:
+            rows: Client rows keyed by column name
+        """
+        if not rows:
+            return
+
+        ids = self.ids.encode_many(row["id"] for row in rows)
+        self.session.execute(
+            _upsert_statement(ClientTable),
+            [{**row, "id": ids[row["id"]]} for row in rows],
+        )
 
     def get_revenue_by_net_worth_level(self) -> list[LevelValues]:
         """
@@ -366,19 +876,25 @@ class ClientRepository:
         Returns:
             List with revenue per net worth level
         """
+        net_worth = TransactionTable.client_net_worth
+        level_case = case(
+            (net_worth < 100_000, "LOW"),
+            (net_worth <= 1_000_000, "MEDIUM"),
+            else_="HIGH",
+        ).label("level")
+
         result = (
             self.session
             .query(
-                ClientTable.net_worth,
+                level_case,
                 func.sum(TransactionTable.amount).label("total_revenue"),
                 func.count(TransactionTable.id).label("transaction_count"),
             )
-            .join(
-                TransactionTable, ClientTable.id == TransactionTable.client_id
-            )
-            .group_by(ClientTable.id)
+            .filter(net_worth.is_not(None))
+            .group_by(level_case)
             .all()
         )
+        totals = {row.level: row for row in result}
 
         levels: dict[str, LevelValues] = {
             "LOW": {"name": "Низкий капитал", "revenue": 0, "count": 0},
@@ -386,19 +902,10 @@ class ClientRepository:
             "HIGH": {"name": "Высокий капитал", "revenue": 0, "count": 0},
         }
 
-        for row in result:
-            if row.net_worth is None:
-                continue
-
-            if row.net_worth < 100_000:
-                level = "LOW"
-            elif row.net_worth <= 1_000_000:
-                level = "MEDIUM"
-            else:
-                level = "HIGH"
-
-            levels[level]["revenue"] += row.total_revenue or 0
-            levels[level]["count"] += row.transaction_count
+        for level, values in levels.items():
+            if level in totals:
+                values["revenue"] = totals[level].total_revenue or 0
+                values["count"] = totals[level].transaction_count
 
         return list(levels.values())
 
@@ -409,45 +916,40 @@ class ClientRepository:
         Returns:
             List with revenue, counts and averages per segment.
         """
-        segment_case = case(
-            (ClientTable.net_worth < 100_000, "Низкий капитал"),
-            (
-                ClientTable.net_worth.between(100_000, 1_000_000),
-                "Средний капитал",
-            ),
-            (ClientTable.net_worth > 1_000_000, "Высокий капитал"),
-            else_="Неизвестно",
-        ).label("segment")
+        client_counts = self.session.execute(
+            select(ClientTable.segment, func.count()).group_by(
+                ClientTable.segment
+            )
+        ).all()
 
-        result = (
-            self.session
+        revenue = {
+            r.segment: r
+            for r in self.session
             .query(
-                segment_case,
-                func.count(ClientTable.id.distinct()).label("client_count"),
+                TransactionTable.client_segment.label("segment"),
                 func.sum(TransactionTable.amount).label("total_revenue"),
                 func.count(TransactionTable.id).label("transaction_count"),
                 func.avg(TransactionTable.amount).label("avg_transaction"),
             )
-            .join(
-                TransactionTable,
-                ClientTable.id == TransactionTable.client_id,
-                isouter=True,
-            )
-            .group_by("segment")
-            .order_by(desc("total_revenue"))
-            .all()
-        )
+            .filter(TransactionTable.client_segment.is_not(None))
+            .group_by(TransactionTable.client_segment)
+        }
 
-        return [
-            {
-                "segment": r.segment,
-                "client_count": r.client_count,
-                "total_revenue": r.total_revenue or 0,
-                "transaction_count": r.transaction_count or 0,
-                "avg_transaction": round(r.avg_transaction or 0, 2),
-            }
-            for r in result
-        ]
+        segments: list[ClientSegmentAnalysis] = []
+        for segment, client_count in client_counts:
+            r = revenue.get(segment)
+            segments.append({
+                "segment": segment,
+                "client_count": client_count,
+                "total_revenue": (r.total_revenue or 0) if r else 0,
+                "transaction_count": r.transaction_count if r else 0,
+                "avg_transaction": (
+                    round(r.avg_transaction or 0, 2) if r else 0
+                ),
+            })
+
+        segments.sort(key=itemgetter("total_revenue"), reverse=True)
+        return segments
 
     def get_clients_without_transactions(self) -> int:
         """Count clients who never made a transaction."""
@@ -471,24 +973,63 @@ class AnalysisRepository:
     def save_result(
         self, name: str, result: Any, parameters: dict | None = None
     ) -> None:
-        """Save analysis result to database."""
-        orm_obj = AnalysisResultTable(
-            analysis_name=name,
-            result_json=result,
-            parameters=parameters,
+        """
+        Save analysis result to database.
+
+        Uses a Core INSERT, so the payload is encoded once by the column
+        type (orjson bytes via OrjsonBlob on SQLite) without going through
+        the identity map.
+        """
+        self.session.execute(
+            insert(AnalysisResultTable),
+            {
+                "analysis_name": name,
+                "result_json": result,
+                "parameters": parameters,
+            },
         )
-        self.session.add(orm_obj)
 
     def get_latest_result(self, name: str) -> dict | None:
-        """Get most recent analysis result."""
-        result = (
-            self.session
-            .query(AnalysisResultTable)
-            .filter(AnalysisResultTable.analysis_name == name)
+        """
+        Get most recent analysis result.
+
+        The raw payload bytes are cached per (name, id, created_at), so
+        repeated reads of an unchanged result skip the BLOB fetch.
+        """
+        latest = self.session.execute(
+            select(AnalysisResultTable.id, AnalysisResultTable.created_at)
+            .where(AnalysisResultTable.analysis_name == name)
             .order_by(desc(AnalysisResultTable.created_at))
-            .first()
-        )
+            .limit(1)
+        ).first()
+        if latest is None:
+            return None
+
+        bind = self.session.get_bind()
+        cache = QueryCache.for_engine(bind)
+        key = ("latest_result", name, latest.id, latest.created_at)
+        payload = cache.get(key)
+        if payload is None:
+            payload = self._fetch_payload(latest.id, bind.dialect)
+            if payload is None:
+                return None
+            cache.put(key, payload)
+        return orjson.loads(payload)
+
+    def _fetch_payload(self, result_id: int, dialect: Dialect) -> bytes | None:
+        """
+        Read a stored result as orjson bytes.
 
-        if result:
-            return result.result_json
-        return None
+        OrjsonBlob storage (SQLite) already holds those bytes, so they are
+        read raw; other storage (JSONB on PostgreSQL) returns a document
+        that is encoded here.
+        """
+        column = AnalysisResultTable.result_json
+        where = AnalysisResultTable.id == result_id
+        if isinstance(column.type.dialect_impl(dialect), OrjsonBlob):
+            return self.session.scalar(
+                select(type_coerce(column, LargeBinary)).where(where)
+            )
+
+        document = self.session.scalar(select(column).where(where))
+        return None if document is None else orjson.dumps(document)
@@ -2,14 +2,24 @@
 Database warehouse initialization and session management.
 """
 
+import sqlite3
+from collections.abc import Generator
+from contextlib import closing, contextmanager
 from pathlib import Path
+from typing import Any, ClassVar
 
-from sqlalchemy import Engine, create_engine
-from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy import Engine, create_engine, event, inspect
+from sqlalchemy.orm import (
+    ORMExecuteState,
+    Session,
+    raiseload,
+    sessionmaker,
+)
+from sqlalchemy.pool import QueuePool, StaticPool
 from structlog import get_logger
 
 from .models import Base
+from .repository import QueryCache
 
 logger = get_logger(__name__)
 
@@ -21,42 +31,83 @@ class Warehouse:
     Handles SQLite connection and session lifecycle.
     """
 
-    def __init__(self, db_path: Path | str = ":memory:"):
+    PRAGMAS: ClassVar = (
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA cache_size=-131072",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA mmap_size=268435456",
+    )
+
+    POOL_SIZE: ClassVar[int] = 8
+    POOL_MAX_OVERFLOW: ClassVar[int] = 16
+
+    # Stored in PRAGMA user_version; bump on incompatible schema changes.
+    # 1: integer surrogate ids (IdMapTable), generated client segment.
+    SCHEMA_VERSION: ClassVar[int] = 1
+
+    def __init__(
+        self,
+        db_path: Path | str = ":memory:",
+        strict_loading: bool = False,
+        reset_outdated_schema: bool = False,
+    ):
         """
         Initialize warehouse connection.
 
         Args:
             db_path: Path to SQLite database file.
                    Use ":memory:" for in-memory database.
+            strict_loading: If True, ORM queries raise on any relationship
+                load that was not requested explicitly (debug aid for N+1).
+            reset_outdated_schema: If True, a database built with another
+                SCHEMA_VERSION is dropped and recreated empty; otherwise
+                opening it raises RuntimeError.
         """
         self.db_path = str(db_path)
+        self.strict_loading = strict_loading
+        self.reset_outdated_schema = reset_outdated_schema
         self.engine: Engine | None = None
         self.SessionLocal: sessionmaker[Session] | None = None
         self._initialize()
 
+    @property
+    def in_memory(self) -> bool:
+        """Whether the warehouse lives in a single :memory: connection."""
+        return self.db_path == ":memory:"
+
     def _initialize(self) -> None:
         """Create engine and session factory."""
         connect_args: dict[str, str | bool | int] = {
             "check_same_thread": False,
             "timeout": 15,
         }
+        pool_args: dict[str, Any]
 
         if self.db_path == ":memory:":
             logger.warning(
                 "db_path is not configured. Using :memory: instead."
             )
-            connect_args["url"] = True
-            connect_args["cached"] = "shared"
+            # Every connection to :memory: is a separate database, so all
+            # sessions share the single StaticPool connection instead.
+            pool_args = {"poolclass": StaticPool}
+        else:
+            # WAL lets each pooled connection read concurrently.
+            pool_args = {
+                "poolclass": QueuePool,
+                "pool_size": self.POOL_SIZE,
+                "max_overflow": self.POOL_MAX_OVERFLOW,
+            }
 
         self.engine = create_engine(
             f"sqlite:///{self.db_path}",
             connect_args=connect_args,
             echo=False,
-            poolclass=StaticPool,
             future=True,
+            **pool_args,
         )
+        event.listen(self.engine, "connect", self._apply_pragmas)
 
-        Base.metadata.create_all(self.engine)
+        self._prepare_schema(self.engine)
 
         self.SessionLocal = sessionmaker(
             bind=self.engine,
@@ -64,9 +115,131 @@ class Warehouse:
             expire_on_commit=False,
             future=True,
         )
+        if self.strict_loading:
+            event.listen(
+                self.SessionLocal, "do_orm_execute", self._raise_on_lazy_load
+            )
 
         logger.info(f"Warehouse initialized at {self.db_path}")
 
+    def _prepare_schema(self, engine: Engine) -> None:
+        """Check the stored schema version, then create missing tables."""
+        with engine.begin() as connection:
+            version = connection.exec_driver_sql(
+                "PRAGMA user_version"
+            ).scalar()
+            if (
+                version != self.SCHEMA_VERSION
+                and inspect(connection).get_table_names()
+            ):
+                if not self.reset_outdated_schema:
+                    raise RuntimeError(
+                        f"Warehouse {self.db_path} has schema version "
+                        f"{version}, expected {self.SCHEMA_VERSION}. "
+                        "Rebuild it, e.g. run the pipeline with --clear-db."
+                    )
+                logger.warning(
+                    f"Warehouse schema version {version} is outdated, "
+                    f"recreating tables for version {self.SCHEMA_VERSION}"
+                )
+                Base.metadata.drop_all(connection)
+
+            Base.metadata.create_all(connection)
+            connection.exec_driver_sql(
+                f"PRAGMA user_version = {self.SCHEMA_VERSION}"
+            )
+
+    @classmethod
+    def schema_is_current(cls, db_path: Path | str) -> bool:
+        """
+        Check whether a database file can be opened without a rebuild.
+
+        Reads PRAGMA user_version with a read-only stdlib connection, so
+        no engine is created. A file without tables counts as current.
+        """
+        uri = f"{Path(db_path).resolve().as_uri()}?mode=ro"
+        with closing(sqlite3.connect(uri, uri=True)) as connection:
+            (version,) = connection.execute("PRAGMA user_version").fetchone()
+            has_tables = connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' LIMIT 1"
+            ).fetchone()
+        return version == cls.SCHEMA_VERSION or has_tables is None
+
+    def _apply_pragmas(self, dbapi_connection: Any, _record: Any) -> None:
+        """
+        Tune every new SQLite connection for bulk loads and aggregate reads.
+
+        WAL journaling is skipped for in-memory databases.
+        """
+        cursor = dbapi_connection.cursor()
+        try:
+            if self.db_path != ":memory:":
+                cursor.execute("PRAGMA journal_mode=WAL")
+            for pragma in self.PRAGMAS:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+    @staticmethod
+    def _raise_on_lazy_load(state: ORMExecuteState) -> None:
+        """Apply raiseload("*") to top-level ORM SELECTs."""
+        if state.is_select and not (
+            state.is_column_load or state.is_relationship_load
+        ):
+            state.statement = state.statement.options(raiseload("*"))
+
+    @contextmanager
+    def bulk_load(self) -> Generator[Session]:
+        """
+        Provide a session with fsync disabled for the duration of a load.
+
+        The session is bound to one connection held for the whole block,
+        so commits inside it keep using the connection that runs with
+        synchronous=OFF, and NORMAL is restored on that same connection
+        before it goes back to the pool. The caller is responsible for
+        committing.
+
+        Yields:
+            SQLAlchemy Session object
+        """
+        if not self.engine or not self.SessionLocal:
+            raise RuntimeError("Warehouse not properly initialized")
+
+        with self.engine.connect() as connection:
+            connection.exec_driver_sql("PRAGMA synchronous=OFF")
+            connection.commit()
+            session = self.SessionLocal(bind=connection)
+            try:
+                yield session
+            finally:
+                try:
+                    session.close()
+                finally:
+                    connection.rollback()
+                    connection.exec_driver_sql("PRAGMA synchronous=NORMAL")
+                    connection.commit()
+
+    @contextmanager
+    def read_session(self) -> Generator[Session]:
+        """
+        Provide a session for read-only queries.
+
+        Opens an explicit BEGIN DEFERRED transaction, so every query in
+        the session reads the same WAL snapshot under a shared lock and
+        never blocks the writer. Skipped for :memory:, where all sessions
+        share one connection that may already be inside a transaction.
+
+        Yields:
+            SQLAlchemy Session object
+        """
+        session = self.get_session()
+        try:
+            if self.db_path != ":memory:":
+                session.connection().exec_driver_sql("BEGIN DEFERRED")
+            yield session
+        finally:
+            session.close()
+
     def get_session(self) -> Session:
         """
         Get a new database session.
@@ -89,9 +262,18 @@ class Warehouse:
         if self.engine:
             Base.metadata.drop_all(self.engine)
             Base.metadata.create_all(self.engine)
+            QueryCache.for_engine(self.engine).invalidate()
         logger.warning("All warehouse data cleared")
 
 
-def create_warehouse(db_path: Path | str = ":memory:") -> Warehouse:
+def create_warehouse(
+    db_path: Path | str = ":memory:",
+    strict_loading: bool = False,
+    reset_outdated_schema: bool = False,
+) -> Warehouse:
     """Create and return a Warehouse instance."""
-    return Warehouse(db_path)
+    return Warehouse(
+        db_path,
+        strict_loading=strict_loading,
+        reset_outdated_schema=reset_outdated_schema,
+    )
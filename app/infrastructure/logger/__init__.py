@@ -1,12 +1,18 @@
 from structlog import get_logger
 
 from .interfaces import ILoggingConfig
-from .manager import bind_context, clear_context, setup_logging
+from .manager import (
+    bind_context,
+    clear_context,
+    flush_logs,
+    setup_logging,
+)
 
 __all__ = [
     "ILoggingConfig",
     "bind_context",
     "clear_context",
+    "flush_logs",
     "get_logger",
     "setup_logging",
 ]
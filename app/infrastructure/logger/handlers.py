@@ -1,17 +1,17 @@
 import sys
-from logging import Handler, StreamHandler
-from logging.handlers import RotatingFileHandler
+from logging import Handler, LogRecord, StreamHandler
+from logging.handlers import QueueHandler, RotatingFileHandler
 from pathlib import Path
 from typing import Any, Literal, overload
 
-from app.utils import Singleton
+from app.utils import EagerSingleton
 
 from .decorators import register_in
 from .enums import HandlerNames
 from .interfaces import BaseLoggerFactory, IHandler, ILoggingConfig
 
 
-class HandlerFactory(BaseLoggerFactory[IHandler], metaclass=Singleton):
+class HandlerFactory(BaseLoggerFactory[IHandler], metaclass=EagerSingleton):
     @overload
     def create(
         self,
@@ -33,6 +33,19 @@ class HandlerFactory(BaseLoggerFactory[IHandler], metaclass=Singleton):
         return processor_cls(**kwargs)
 
 
+class StructlogQueueHandler(QueueHandler):
+    """
+    QueueHandler that enqueues records untouched.
+
+    The stock prepare() formats the record on the caller's thread and
+    replaces msg with the rendered string, which would hide structlog's
+    event dict from the ProcessorFormatter running in the listener.
+    """
+
+    def prepare(self, record: LogRecord) -> LogRecord:
+        return record
+
+
 class HandlerBuilder:
     def __init__(self, factory: HandlerFactory) -> None:
         self.factory = factory
@@ -1,25 +1,40 @@
+import atexit
 import logging
+import sys
 from logging import Handler
-from typing import Any
+from logging.handlers import MemoryHandler, QueueListener
+from queue import SimpleQueue
+from typing import Any, ClassVar
 
 import structlog
+from structlog.contextvars import (
+    bind_contextvars,
+    clear_contextvars,
+    unbind_contextvars,
+)
 
 from app.utils import Singleton
 
 from .enums import LoggersToHijack
-from .handlers import HandlerBuilder, HandlerFactory
+from .handlers import HandlerBuilder, HandlerFactory, StructlogQueueHandler
 from .interfaces import ILoggingConfig
 from .processors import ProcessorBuilder, ProcessorFactory
 from .renderers import RendererBuilder, RendererFactory
 
 
 class LoggerManager(metaclass=Singleton):
+    FILE_BUFFER_CAPACITY: ClassVar[int] = 1024
+
     def __init__(self) -> None:
         self.config: ILoggingConfig | None = None
         self.handler_builder: HandlerBuilder | None = None
         self.processor_builder: ProcessorBuilder | None = None
         self.renderer_builder: RendererBuilder | None = None
         self.is_configured = False
+        self._listener: QueueListener | None = None
+        self._close_at_exit = False
+        # Lives on the instance, so Singleton.clear_singleton() drops it.
+        self._logger_cache: dict[str, Any] = {}
 
     def _configure_structlog(self) -> None:
         if (
@@ -33,13 +48,18 @@ class LoggerManager(metaclass=Singleton):
                 "Call 'setup_logging()' first."
             )
 
-        shared_processors = self.processor_builder.build_shared_chain()
+        shared_processors = self.processor_builder.build_shared_chain(
+            self.config.debug
+        )
         formatter_wrapper = self.processor_builder.build_formatter_wrapper()
 
         structlog.configure(
-            processors=[*shared_processors, formatter_wrapper],
+            processors=(*shared_processors, formatter_wrapper),
             logger_factory=structlog.stdlib.LoggerFactory(),
-            wrapper_class=structlog.stdlib.BoundLogger,
+            # Calls below log_level return before any processor runs.
+            wrapper_class=structlog.make_filtering_bound_logger(
+                logging.getLevelName(self.config.log_level)
+            ),
             cache_logger_on_first_use=True,
         )
 
@@ -54,11 +74,89 @@ class LoggerManager(metaclass=Singleton):
         for handler in handlers:
             handler.setFormatter(formatter)
             handler.setLevel(self.config.log_level)
+        handlers = [self._buffer_file_handler(h) for h in handlers]
+
+        # Callers only enqueue records; rendering and I/O happen on the
+        # listener's background thread.
+        log_queue: SimpleQueue[logging.LogRecord] = SimpleQueue()
+        # Reconfiguring must not leak the previous listener's files.
+        self.close()
+        self._listener = QueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+        self._listener.start()
+        if not self._close_at_exit:
+            atexit.register(self.close)
+            self._close_at_exit = True
 
         root_logger = logging.getLogger()
-        root_logger.handlers = handlers
+        self._close_replaced_handlers(root_logger.handlers)
+        root_logger.handlers = [StructlogQueueHandler(log_queue)]
         root_logger.setLevel(self.config.log_level)
 
+    @staticmethod
+    def _close_replaced_handlers(handlers: list[Handler]) -> None:
+        """
+        Release the streams and files of root handlers being replaced.
+
+        Only stream and file handlers are closed, and handlers writing to
+        the process std streams are left open; anything else is left to
+        whoever installed it.
+        """
+        std_streams = {
+            id(stream)
+            for stream in (
+                sys.stdout,
+                sys.stderr,
+                sys.__stdout__,
+                sys.__stderr__,
+            )
+            if stream is not None
+        }
+        for handler in handlers:
+            if not isinstance(handler, logging.StreamHandler):
+                continue
+            if id(handler.stream) in std_streams:
+                continue
+            handler.close()
+
+    def _buffer_file_handler(self, handler: Handler) -> Handler:
+        if not isinstance(handler, logging.FileHandler):
+            return handler
+        # Batch disk writes; errors still reach the file immediately.
+        buffered = MemoryHandler(
+            capacity=self.FILE_BUFFER_CAPACITY,
+            flushLevel=logging.ERROR,
+            target=handler,
+        )
+        buffered.setLevel(handler.level)
+        return buffered
+
+    def flush(self) -> None:
+        """Drain queued records and write out buffered file output."""
+        if self._listener is None:
+            return
+        self._listener.stop()
+        for handler in self._listener.handlers:
+            handler.flush()
+        self._listener.start()
+
+    def close(self) -> None:
+        """Drain the queue, then flush and close every output handler."""
+        if self._listener is None:
+            return
+        self._listener.stop()
+        for handler in self._listener.handlers:
+            handler.flush()
+            # MemoryHandler.close() drops its target without closing it.
+            target = (
+                handler.target if isinstance(handler, MemoryHandler) else None
+            )
+            handler.close()
+            if target is not None:
+                target.close()
+        self._listener = None
+
     def _configure_third_party_loggers(self):
         for logger_enum in LoggersToHijack:
             logger_enum.hijack()
@@ -92,28 +190,41 @@ class LoggerManager(metaclass=Singleton):
         self.is_configured = True
 
     def get_logger(self, name: str):
+        cached = self._logger_cache.get(name)
+        if cached is not None:
+            return cached
+
         self._ensure_configured()
-        return structlog.get_logger(name)
+        # Resolve the stdlib logger's effective level and materialize the
+        # bound logger now, so the first real log call does not pay for it.
+        logging.getLogger(name).isEnabledFor(logging.DEBUG)
+        logger = structlog.get_logger(name).bind()
+        self._logger_cache[name] = logger
+        return logger
 
 
 def get_logger_manager() -> LoggerManager:
     return LoggerManager()
 
 
-def get_logger(name: str) -> structlog.stdlib.BoundLogger:
+def get_logger(name: str) -> structlog.typing.FilteringBoundLogger:
     logger_manager = get_logger_manager()
     return logger_manager.get_logger(name)
 
 
+def flush_logs() -> None:
+    get_logger_manager().flush()
+
+
 def bind_context(**kwargs: Any):
-    structlog.contextvars.bind_contextvars(**kwargs)
+    bind_contextvars(**kwargs)
 
 
 def clear_context(*keys: Any):
     if keys:
-        structlog.contextvars.unbind_contextvars(*keys)
+        unbind_contextvars(*keys)
     else:
-        structlog.contextvars.clear_contextvars()
+        clear_contextvars()
 
 
 def setup_logging(config: ILoggingConfig):
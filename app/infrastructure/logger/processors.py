@@ -3,7 +3,7 @@ from typing import Any, Literal, overload
 import structlog
 from structlog.types import EventDict, Processor
 
-from app.utils import Singleton
+from app.utils import EagerSingleton
 
 from .decorators import register_in
 from .enums import ProcessorNames
@@ -15,7 +15,9 @@ from .interfaces import (
 )
 
 
-class ProcessorFactory(BaseLoggerFactory[ILogProcessor], metaclass=Singleton):
+class ProcessorFactory(
+    BaseLoggerFactory[ILogProcessor], metaclass=EagerSingleton
+):
     @overload
     def create(
         self,
@@ -26,7 +28,11 @@ class ProcessorFactory(BaseLoggerFactory[ILogProcessor], metaclass=Singleton):
 
     @overload
     def create(
-        self, name: Literal[ProcessorNames.TIMESTAMP], *, fmt: str | None = ...
+        self,
+        name: Literal[ProcessorNames.TIMESTAMP],
+        *,
+        fmt: str | None = ...,
+        utc: bool = ...,
     ) -> ILogProcessor: ...
 
     @overload
@@ -59,23 +65,47 @@ class ProcessorBuilder:
     ) -> None:
         self.factory = factory
         self.additional_processors = additional_processors or []
+        self._base_chains: dict[bool, tuple[ILogProcessor, ...]] = {}
+
+    def build_base_chain(
+        self, debug: bool = True
+    ) -> tuple[ILogProcessor, ...]:
+        # The processors are stateless, so one set of instances is shared
+        # by every chain this builder produces.
+        chain = self._base_chains.get(debug)
+        if chain is None:
+            chain = self._base_chains[debug] = self._create_base_chain(debug)
+        return chain
 
-    def build_base_chain(self) -> list[ILogProcessor]:
-        return [
+    def _create_base_chain(self, debug: bool) -> tuple[ILogProcessor, ...]:
+        return (
             self.factory.create(ProcessorNames.MERGE_CONTEXTVARS),
             self.factory.create(ProcessorNames.ADD_LOGGER_NAME),
             self.factory.create(ProcessorNames.ADD_LOG_LEVEL),
             self.factory.create(ProcessorNames.POSITIONAL_ARGS),
-            self.factory.create(ProcessorNames.TIMESTAMP),
+            self._create_timestamper(debug),
             self.factory.create(ProcessorNames.STACK_INFO),
             self.factory.create(ProcessorNames.EXC_INFO),
-        ]
+        )
 
-    def build_shared_chain(self) -> list[ILogProcessor]:
-        chain = self.build_base_chain()
-        chain.append(self.factory.create(ProcessorNames.MESSAGE_CLEANER))
-        chain.extend(self.additional_processors)
-        return chain
+    def _create_timestamper(self, debug: bool) -> ILogProcessor:
+        if debug:
+            return self.factory.create(ProcessorNames.TIMESTAMP)
+        # JSON output keeps the raw epoch float and skips strftime.
+        return self.factory.create(
+            ProcessorNames.TIMESTAMP, fmt=None, utc=True
+        )
+
+    def build_shared_chain(
+        self, debug: bool = True
+    ) -> tuple[ILogProcessor, ...]:
+        # Tuples are cheaper to iterate on every log call and can't be
+        # mutated after structlog has been configured with them.
+        return (
+            *self.build_base_chain(debug),
+            self.factory.create(ProcessorNames.MESSAGE_CLEANER),
+            *self.additional_processors,
+        )
 
     def build_formatter_wrapper(self) -> ILogProcessor:
         return self.factory.create(ProcessorNames.FORMATTER_WRAPPER)
@@ -94,8 +124,14 @@ class LogMessageCleaner:
             method_name: The log method name
             event_dict: The event dictionary to process
         """
-        if "event" in event_dict:
-            event_dict["event"] = event_dict["event"].strip()
+        event = event_dict.get("event")
+        # Only reallocate when there is something to strip.
+        if (
+            type(event) is str
+            and event
+            and (event[0].isspace() or event[-1].isspace())
+        ):
+            event_dict["event"] = event.strip()
         return event_dict
 
 
@@ -103,6 +139,7 @@ class AppContextAdder:
     def __init__(self, app_name: str, debug: bool) -> None:
         self.app_name = app_name
         self.debug = debug
+        self._items = (("app", app_name), ("debug", debug))
 
     def __call__(
         self, logger: Any, method_name: str, event_dict: EventDict
@@ -115,8 +152,9 @@ class AppContextAdder:
             method_name: The log method name
             event_dict: The event dictionary to process
         """
-        event_dict.setdefault("app", self.app_name)
-        event_dict.setdefault("debug", self.debug)
+        setdefault = event_dict.setdefault
+        for key, value in self._items:
+            setdefault(key, value)
         return event_dict
 
 
@@ -148,8 +186,12 @@ class PositionalArgsFormatterStrategy(BaseProcessorStrategy):
 
 @register_in(ProcessorFactory, ProcessorNames.TIMESTAMP)
 class TimestampStamperStrategy(BaseProcessorStrategy):
-    def __init__(self, fmt: str | None = "%Y-%m-%d %H:%M:%S") -> None:
-        self.processor: Processor = structlog.processors.TimeStamper(fmt=fmt)
+    def __init__(
+        self, fmt: str | None = "%Y-%m-%d %H:%M:%S", utc: bool = False
+    ) -> None:
+        self.processor: Processor = structlog.processors.TimeStamper(
+            fmt=fmt, utc=utc
+        )
 
 
 @register_in(ProcessorFactory, ProcessorNames.STACK_INFO)
@@ -6,14 +6,16 @@ import structlog
 from structlog.types import EventDict, Processor, WrappedLogger
 from structlog.typing import ProcessorReturnValue
 
-from app.utils import Singleton
+from app.utils import EagerSingleton
 
 from .decorators import register_in
 from .enums import RendererNames
 from .interfaces import BaseLoggerFactory, ILogProcessor
 
 
-class RendererFactory(BaseLoggerFactory[ILogProcessor], metaclass=Singleton):
+class RendererFactory(
+    BaseLoggerFactory[ILogProcessor], metaclass=EagerSingleton
+):
     @overload
     def create(
         self,
@@ -49,27 +51,21 @@ class RendererBuilder:
             )
 
 
+def _json_default(obj: Any) -> str:
+    return repr(obj)
+
+
 @register_in(RendererFactory, RendererNames.JSON)
 class JsonRenderStrategy:
+    # orjson is called directly rather than through JSONRenderer, which
+    # adds a serializer indirection and kwargs plumbing per record.
     def __init__(self) -> None:
-        self.renderer: Processor = structlog.processors.JSONRenderer(
-            serializer=self._serializer
-        )
+        self._dumps: Callable[..., bytes] = orjson.dumps
 
     def __call__(
         self, logger: WrappedLogger, method_name: str, event_dict: EventDict
     ) -> ProcessorReturnValue:
-        return self.renderer(logger, method_name, event_dict)
-
-    def _serializer(
-        self,
-        data: Any,
-        default: Callable[[Any], Any] | None = None,
-        option: int | None = None,
-    ) -> str:
-        return orjson.dumps(data, default=default, option=option).decode(
-            "utf-8"
-        )
+        return self._dumps(event_dict, default=_json_default).decode()
 
 
 @register_in(RendererFactory, RendererNames.CONSOLE)
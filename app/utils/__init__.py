@@ -1,5 +1,6 @@
-from .metaclasses import Singleton
+from .metaclasses import EagerSingleton, Singleton
 
 __all__ = [
+    "EagerSingleton",
     "Singleton",
 ]
@@ -1,26 +1,63 @@
 from abc import ABCMeta
-from threading import Lock
-from typing import Any, ClassVar, cast
+from threading import RLock
+from typing import Any, ClassVar
 
 
 class Singleton(ABCMeta):
     __instances: ClassVar[dict[type[Any], object]] = {}
-    __lock: ClassVar[Lock] = Lock()
+    # Reentrant so a singleton's __init__ can create other singletons.
+    __lock: ClassVar[RLock] = RLock()
 
     def __call__(cls, *args: Any, **kwargs: Any) -> Any:
-        cls_type = cast(type[Any], cls)
+        instances = Singleton.__instances
+        instance = instances.get(cls)
+        if instance is not None:
+            return instance
 
-        if cls_type not in cls.__instances:
-            with cls.__lock:
-                if cls_type not in cls.__instances:
-                    cls.__instances[cls_type] = super().__call__(
-                        *args, **kwargs
-                    )
-        return cls.__instances[cls_type]
+        with Singleton.__lock:
+            instance = instances.get(cls)
+            if instance is None:
+                instance = super().__call__(*args, **kwargs)
+                instances[cls] = instance
+        return instance
 
     @classmethod
-    def clear_singleton(cls, target_class: type[Any] | None = None) -> None:
+    def clear_singleton(
+        cls, target_class: type[Any] | None = None, close: bool = False
+    ) -> None:
         if target_class is None:
+            evicted = list(cls.__instances.values())
             cls.__instances.clear()
         else:
-            cls.__instances.pop(target_class, None)
+            instance = cls.__instances.pop(target_class, None)
+            evicted = [] if instance is None else [instance]
+
+        if not close:
+            return
+        # Opt-in: let evicted instances release what they hold (e.g. the
+        # LoggerManager's listener thread and log files).
+        for instance in evicted:
+            close_instance = getattr(instance, "close", None)
+            if callable(close_instance):
+                close_instance()
+
+
+class EagerSingleton(ABCMeta):
+    """
+    Singleton whose instance is created when the class is defined.
+
+    Meant for argument-free classes such as the logger factories: calls
+    just return the prebuilt instance, with no lock or registry lookup.
+    """
+
+    _instance: Any
+
+    def __init__(
+        cls, name: str, bases: tuple[type, ...], namespace: dict[str, Any]
+    ) -> None:
+        super().__init__(name, bases, namespace)
+        if not cls.__abstractmethods__:
+            cls._instance = super().__call__()
+
+    def __call__(cls) -> Any:
+        return cls._instance
@@ -3,24 +3,49 @@ Main pipeline script.
 
 Usage:
     python run_pipeline.py [--no-plots] [--clear-db] [--forecast-months N]
+                           [--pretty-json]
 """
 
 import argparse
 import hashlib
-import json
+import os
 import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+import orjson
 from structlog import get_logger
 
-from app.application.use_cases import build_warehouse, run_analysis
 from app.config import AppConfig, get_config
-from app.infrastructure.logger import setup_logging
+from app.infrastructure.logger import flush_logs, setup_logging
 
 
 def setup_arg_parser(config: AppConfig) -> argparse.ArgumentParser:
     """Setup command line argument parser."""
+    return _build_arg_parser(
+        str(config.data_paths.transactions_file),
+        str(config.data_paths.clients_file),
+        str(config.data_paths.database_file),
+        config.analysis.forecast_months,
+        config.analysis.min_months_for_forecast,
+    )
+
+
+@lru_cache(maxsize=1)
+def _build_arg_parser(
+    transactions_file: str,
+    clients_file: str,
+    database_file: str,
+    forecast_months: int,
+    min_months_for_forecast: int,
+) -> argparse.ArgumentParser:
+    # Keyed on the default values, so repeated main() calls with the same
+    # config reuse one parser; parse_args() leaves the parser untouched.
+    # Path defaults stay strings: argparse runs type=Path on a string
+    # default only when the option is not given.
     parser = argparse.ArgumentParser(
         description="Run ETL and analysis pipeline for financial data"
     )
@@ -40,33 +65,38 @@ def setup_arg_parser(config: AppConfig) -> argparse.ArgumentParser:
     parser.add_argument(
         "--transactions",
         type=Path,
-        default=Path(config.data_paths.transactions_file),
+        default=transactions_file,
         help="Path to transactions Excel file",
     )
     parser.add_argument(
         "--clients",
         type=Path,
-        default=Path(config.data_paths.clients_file),
+        default=clients_file,
         help="Path to clients JSON file",
     )
     parser.add_argument(
         "--db",
         type=Path,
-        default=Path(config.data_paths.database_file),
+        default=database_file,
         help="Path to SQLite database",
     )
     parser.add_argument(
         "--forecast-months",
         type=int,
-        default=config.analysis.forecast_months,
+        default=forecast_months,
         help="Number of months to forecast",
     )
     parser.add_argument(
         "--min-months-forecast",
         type=int,
-        default=config.analysis.min_months_for_forecast,
+        default=min_months_for_forecast,
         help="Minimum months required for forecast",
     )
+    parser.add_argument(
+        "--pretty-json",
+        action="store_true",
+        help="Indent the saved JSON results (compact by default)",
+    )
     return parser
 
 
@@ -92,124 +122,181 @@ def check_data_files(transactions_path: Path, clients_path: Path) -> bool:
 
 def get_file_hash(file_path: Path) -> str:
     """Calculate SHA256 hash of file."""
-    sha256_hash = hashlib.sha256()
     with open(file_path, "rb") as f:
-        for byte_block in iter(lambda: f.read(4096), b""):
-            sha256_hash.update(byte_block)
-    return sha256_hash.hexdigest()
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def get_file_fingerprint(
+    file_path: Path, saved: dict[str, Any] | None = None
+) -> dict[str, Any]:
+    """
+    Describe a file by size, mtime and SHA256 hash.
+
+    The hash is reused from ``saved`` when size and mtime are unchanged,
+    so unchanged files are never read.
+    """
+    stat = file_path.stat()
+    fingerprint: dict[str, Any] = {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+    if (
+        isinstance(saved, dict)
+        and saved.get("size") == stat.st_size
+        and saved.get("mtime_ns") == stat.st_mtime_ns
+        and "sha256" in saved
+    ):
+        fingerprint["sha256"] = saved["sha256"]
+    else:
+        fingerprint["sha256"] = get_file_hash(file_path)
+    return fingerprint
+
+
+def write_hash_file(hash_file: Path, hashes: dict[str, Any]) -> None:
+    """Write the hash file atomically so a crash never leaves it torn."""
+    with tempfile.NamedTemporaryFile(
+        "wb", dir=hash_file.parent, delete=False
+    ) as tmp:
+        tmp.write(orjson.dumps(hashes))
+    os.replace(tmp.name, hash_file)
+
+
+def read_hash_file(hash_file: Path) -> dict[str, Any]:
+    """Load saved fingerprints, treating a missing or bad file as empty."""
+    try:
+        saved_hashes = orjson.loads(hash_file.read_bytes())
+    except (orjson.JSONDecodeError, FileNotFoundError):
+        return {}
+    return saved_hashes if isinstance(saved_hashes, dict) else {}
+
+
+def get_data_fingerprints(
+    transactions_path: Path,
+    clients_path: Path,
+    saved_hashes: dict[str, Any],
+) -> dict[str, Any]:
+    """Fingerprint both data files, reusing unchanged saved hashes."""
+    # OpenSSL releases the GIL while hashing, so both files are
+    # fingerprinted in parallel.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        transactions_future = executor.submit(
+            get_file_fingerprint,
+            transactions_path,
+            saved_hashes.get("transactions"),
+        )
+        clients_future = executor.submit(
+            get_file_fingerprint, clients_path, saved_hashes.get("clients")
+        )
+        return {
+            "transactions": transactions_future.result(),
+            "clients": clients_future.result(),
+        }
+
+
+def save_data_fingerprints(
+    hash_file: Path, fingerprints: dict[str, Any]
+) -> None:
+    """Record fingerprints of the data files the database now holds."""
+    if fingerprints != read_hash_file(hash_file):
+        write_hash_file(hash_file, fingerprints)
 
 
 def should_clear_database(
     transactions_path: Path,
     clients_path: Path,
     hash_file: Path,
-) -> bool:
+) -> tuple[bool, dict[str, Any]]:
     """
     Check if data files have changed since last run.
 
     Returns:
-        True if database should be cleared, False otherwise.
+        Whether the database should be cleared, and the current file
+        fingerprints so callers don't have to compute them again.
     """
-    current_hashes = {
-        "transactions": get_file_hash(transactions_path),
-        "clients": get_file_hash(clients_path),
-    }
+    saved_hashes = read_hash_file(hash_file)
+    current_hashes = get_data_fingerprints(
+        transactions_path, clients_path, saved_hashes
+    )
 
-    if not hash_file.exists():
-        with open(hash_file, "w") as f:
-            json.dump(current_hashes, f)
-        return True
+    if current_hashes != saved_hashes:
+        write_hash_file(hash_file, current_hashes)
 
-    try:
-        with open(hash_file) as f:
-            saved_hashes = json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
-        return True
+    changed = any(
+        not isinstance(saved_hashes.get(name), dict)
+        or saved_hashes[name].get("sha256") != fingerprint["sha256"]
+        for name, fingerprint in current_hashes.items()
+    )
+    return changed, current_hashes
 
-    if current_hashes != saved_hashes:
-        with open(hash_file, "w") as f:
-            json.dump(current_hashes, f)
-        return True
 
-    return False
+_TREND_EMOJI = {"increasing": "📈", "decreasing": "📉", "stable": "📊"}
+_TREND_LABELS = {
+    "increasing": "Рост",
+    "decreasing": "Падение",
+    "stable": "Стабильно",
+}
+_MEDALS = ("🥇", "🥈", "🥉")
 
 
 def print_summary(results: dict[str, Any]) -> None:
     """Print analysis summary to console."""
-    print("\n" + "_" * 80 + "\n")
-    print("📊 ФИНАНСОВЫЙ АНАЛИЗ - РЕЗУЛЬТАТЫ 📊".center(80))
-    print("_" * 80)
+    # Collected and written once instead of one print() per line.
+    lines: list[str] = []
+    lines.append("\n" + "_" * 80 + "\n")
+    lines.append("📊 ФИНАНСОВЫЙ АНАЛИЗ - РЕЗУЛЬТАТЫ 📊".center(80))
+    lines.append("_" * 80)
 
-    print("\n🏆 ТОП-5 УСЛУГ ПО КОЛИЧЕСТВУ ЗАКАЗОВ:")
+    lines.append("\n🏆 ТОП-5 УСЛУГ ПО КОЛИЧЕСТВУ ЗАКАЗОВ:")
     for i, s in enumerate(results["top_services"], 1):
-        print(f"   {i}. {s['service']}: {s['count']} заказов")
+        lines.append(f"   {i}. {s['service']}: {s['count']} заказов")
 
-    print("\n🏙️  СРЕДНЯЯ СУММА ТРАНЗАКЦИЙ ПО ГОРОДАМ:")
+    lines.append("\n🏙️  СРЕДНЯЯ СУММА ТРАНЗАКЦИЙ ПО ГОРОДАМ:")
     for i, city_data in enumerate(results.get("avg_by_city", [])[:], 1):
-        print(f"   {i}. {city_data['city']}: {city_data['avg_amount']:,.2f}")
+        lines.append(
+            f"   {i}. {city_data['city']}: {city_data['avg_amount']:,.2f}"
+        )
 
     if results["max_revenue_service"]:
-        print("\n💰 УСЛУГА С МАКСИМАЛЬНОЙ ВЫРУЧКОЙ:")
-        print(
+        lines.append("\n💰 УСЛУГА С МАКСИМАЛЬНОЙ ВЫРУЧКОЙ:")
+        lines.append(
             f"   {results['max_revenue_service']['service']}: "
             f"{results['max_revenue_service']['revenue']:,.2f}"
         )
 
-    print("\n💳 РАСПРЕДЕЛЕНИЕ ПО СПОСОБАМ ОПЛАТЫ:")
+    lines.append("\n💳 РАСПРЕДЕЛЕНИЕ ПО СПОСОБАМ ОПЛАТЫ:")
     for i, (method, pct) in enumerate(results["payment_methods"].items(), 1):
-        print(f"   {i}. {method}: {pct}%")
+        lines.append(f"   {i}. {method}: {pct}%")
 
-    print("\n💵 ВЫРУЧКА ЗА ПОСЛЕДНИЙ МЕСЯЦ:")
-    print(f"   {results['last_month_revenue']:,.2f}")
+    lines.append("\n💵 ВЫРУЧКА ЗА ПОСЛЕДНИЙ МЕСЯЦ:")
+    lines.append(f"   {results['last_month_revenue']:,.2f}")
 
-    print("\n👥 АНАЛИЗ ПО СЕГМЕНТАМ КЛИЕНТОВ:")
+    lines.append("\n👥 АНАЛИЗ ПО СЕГМЕНТАМ КЛИЕНТОВ:")
     for i, segment in enumerate(results["client_segments"]):
-        medal = (
-            "🥇" if i == 0 else "🥈" if i == 1 else "🥉" if i == 2 else "🔹"
-        )
-        print(f"  {medal} {segment['segment']}:")
-        print(f"       Клиентов: {segment['client_count']}")
-        print(f"       Выручка: {segment['total_revenue']:,.2f}")
-        print(f"       Транзакций: {segment['transaction_count']}")
-        print(f"       Средний чек: {segment['avg_transaction']:,.2f}")
+        medal = _MEDALS[i] if i < len(_MEDALS) else "🔹"
+        lines.append(f"  {medal} {segment['segment']}:")
+        lines.append(f"       Клиентов: {segment['client_count']}")
+        lines.append(f"       Выручка: {segment['total_revenue']:,.2f}")
+        lines.append(f"       Транзакций: {segment['transaction_count']}")
+        lines.append(f"       Средний чек: {segment['avg_transaction']:,.2f}")
 
     forecast = results.get("forecast", {})
     if forecast.get("available", False):
-        print("\n🔮 ПРОГНОЗ НА СЛЕДУЮЩИЙ МЕСЯЦ:")
+        lines.append("\n🔮 ПРОГНОЗ НА СЛЕДУЮЩИЙ МЕСЯЦ:")
 
-        if forecast.get("count_forecast"):
+        count_forecast = forecast.get("count_forecast")
+        if count_forecast:
             trend = forecast.get("count_trend", "stable")
-            trend_emoji = {
-                "increasing": "📈",
-                "decreasing": "📉",
-                "stable": "📊",
-            }.get(trend, "📊")
-            trend_str = {
-                "increasing": "Рост",
-                "decreasing": "Падение",
-                "stable": "Стабильно",
-            }.get(trend, "")
-            print(
-                f"   {trend_emoji} Транзакций: "
-                f"{forecast['count_forecast'][0]} "
-                f"({trend_str})"
+            lines.append(
+                f"   {_TREND_EMOJI.get(trend, '📊')} Транзакций: "
+                f"{count_forecast[0]} ({_TREND_LABELS.get(trend, '')})"
             )
 
-        if forecast.get("revenue_forecast"):
+        revenue_forecast = forecast.get("revenue_forecast")
+        if revenue_forecast:
             trend = forecast.get("revenue_trend", "stable")
-            trend_emoji = {
-                "increasing": "📈",
-                "decreasing": "📉",
-                "stable": "📊",
-            }.get(trend, "📊")
-            trend_str = {
-                "increasing": "Рост",
-                "decreasing": "Падение",
-                "stable": "Стабильно",
-            }.get(trend, "")
-            print(
-                f"   {trend_emoji} Выручка: "
-                f"{forecast['revenue_forecast'][0]:,.2f} ({trend_str})"
+            lines.append(
+                f"   {_TREND_EMOJI.get(trend, '📊')} Выручка: "
+                f"{revenue_forecast[0]:,.2f} ({_TREND_LABELS.get(trend, '')})"
             )
 
         if "metrics" in forecast:
@@ -225,44 +312,56 @@ def print_summary(results: dict[str, Any]) -> None:
                     if r2 > 0.3
                     else "слабое"
                 )
-                print(
+                lines.append(
                     f"   ❓ Качество прогноза (R²): {r2:.3f} "
                     f"{quality_emoji} ({quality})"
                 )
     else:
-        print("\n🔮 ПРОГНОЗ:")
-        print(f"  ⚠️ {forecast.get('message', 'Прогноз недоступен')}")
+        lines.append("\n🔮 ПРОГНОЗ:")
+        lines.append(f"  ⚠️ {forecast.get('message', 'Прогноз недоступен')}")
 
     if "report" in results:
         report_info = results["report"]
-        print("\n" + "_" * 80)
-        print("\nОТЧЁТЫ СОЗДАНЫ:")
-        print(f"  📄 Markdown: {report_info['markdown']}")
-        print(f"  📊 JSON: {report_info['json']}")
-        print(f"  📁 Папка: {report_info['folder']}")
+        lines.append("\n" + "_" * 80)
+        lines.append("\nОТЧЁТЫ СОЗДАНЫ:")
+        lines.append(f"  📄 Markdown: {report_info['markdown']}")
+        lines.append(f"  📊 JSON: {report_info['json']}")
+        lines.append(f"  📁 Папка: {report_info['folder']}")
 
-    print("\n" + "_" * 80)
-    print("\n")
+    lines.append("\n" + "_" * 80)
+    lines.append("\n")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def main() -> int | None:
     """Main pipeline execution."""
     config = get_config()
-    setup_logging(config.logger_adapter)
-    logger = get_logger("run_pipeline.py")
-
+    # Parse first so --help and usage errors exit before logging starts.
     parser = setup_arg_parser(config)
     args = parser.parse_args()
 
+    setup_logging(config.logger_adapter)
+    logger = get_logger("run_pipeline.py")
+
     logger.info("=== START PIPELINE ===")
 
+    hash_file = config.data_paths.data_hashes_file
+    db_missing = not args.db.exists()
+    # A missing database is rebuilt without checking for changes; its
+    # fingerprints are written to the hash file once the build succeeds.
+    record_fingerprints = False
+    data_fingerprints: dict[str, Any] | None = None
+
     if args.no_clear:
         should_clear = False
     elif args.clear_db:
         should_clear = True
+    elif db_missing:
+        should_clear = True
+        record_fingerprints = True
     else:
-        should_clear = should_clear_database(
-            args.transactions, args.clients, config.data_paths.data_hashes_file
+        should_clear, data_fingerprints = should_clear_database(
+            args.transactions, args.clients, hash_file
         )
         if should_clear:
             logger.info("Automatic database cleanup (data files have changed)")
@@ -271,15 +370,36 @@ def main() -> int | None:
         return 1
 
     try:
+        # Deferred: pulls in pandas, numpy and SQLAlchemy, which only the
+        # pipeline stages below need.
+        from app.application.use_cases import build_warehouse, run_analysis
+        from app.infrastructure.database import Warehouse
+
+        if not (
+            should_clear or db_missing or args.no_clear
+        ) and not Warehouse.schema_is_current(args.db):
+            logger.info("Database schema is outdated. Rebuilding database.")
+            should_clear = True
+
         logger.info("STAGE 1: LOADING DATA INTO THE STORAGE")
 
-        if should_clear or not config.data_paths.database_file.exists():
+        if should_clear or db_missing:
+            # Every rebuild is stamped with the inputs it was built from.
+            if data_fingerprints is None:
+                data_fingerprints = get_data_fingerprints(
+                    args.transactions,
+                    args.clients,
+                    read_hash_file(hash_file),
+                )
             load_results = build_warehouse(
                 transactions_path=args.transactions,
                 clients_path=args.clients,
                 db_path=args.db,
                 clear=should_clear,
+                data_fingerprints=data_fingerprints,
             )
+            if record_fingerprints:
+                save_data_fingerprints(hash_file, data_fingerprints)
 
             logger.info(
                 f"Transactions loaded: {load_results['transactions_loaded']}"
@@ -296,10 +416,13 @@ def main() -> int | None:
             generate_plots=not args.no_plots,
             forecast_months=args.forecast_months,
             min_months_for_forecast=args.min_months_forecast,
+            pretty_json=args.pretty_json,
         )
 
         logger.info("STAGE 3: REPORT GENERATION")
 
+        # Drain queued log lines so none interleave with the report.
+        flush_logs()
         print_summary(analysis_results)
 
         return 0
@@ -307,6 +430,7 @@ def main() -> int | None:
     except Exception as e:
         logger.exception("Pipeline failed")
         logger.error(f"{e}")
+        flush_logs()
         return 1
 
 
@@ -0,0 +1,24 @@
+"""Shared fixtures for the test suite."""
+
+from collections.abc import Iterator
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.infrastructure.database import Warehouse, create_warehouse
+
+
+@pytest.fixture
+def warehouse() -> Iterator[Warehouse]:
+    """Fresh in-memory warehouse."""
+    warehouse = create_warehouse(":memory:")
+    yield warehouse
+    warehouse.close()
+
+
+@pytest.fixture
+def session(warehouse: Warehouse) -> Iterator[Session]:
+    """Session bound to the in-memory warehouse."""
+    session = warehouse.get_session()
+    yield session
+    session.close()
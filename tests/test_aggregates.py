@@ -0,0 +1,292 @@
+"""Aggregate queries checked against the queries they replaced."""
+
+from collections import Counter, defaultdict
+from datetime import datetime
+from uuid import uuid4
+
+import orjson
+import pytest
+from sqlalchemy import case, desc, func, select
+from sqlalchemy.dialects import postgresql
+
+from app.domain.entities import Client, Gender, Transaction
+from app.infrastructure.database import (
+    AnalysisRepository,
+    AnalysisResultTable,
+    ClientRepository,
+    ClientTable,
+    TransactionRepository,
+    TransactionTable,
+    create_warehouse,
+)
+
+pytestmark = pytest.mark.unit
+
+NET_WORTHS = [5_000.0, 100_000.0, 250_000.0, 1_000_000.0, 3_000_000.0]
+SERVICES = ["Управление активами", "Налоговое планирование", "Другое"]
+PAYMENT_METHODS = ["Наличные", "Кредитная карта", "Неизвестно"]
+CITIES = ["Москва", "Казань", None]
+
+
+@pytest.fixture
+def transactions(session) -> list[Transaction]:
+    client_ids = [uuid4() for _ in NET_WORTHS]
+    # The last client has no transactions; some transactions no client.
+    owners = [*client_ids[:-1], None]
+    transactions = [
+        Transaction(
+            id=uuid4(),
+            client_id=owners[i % len(owners)],
+            transaction_date=datetime(2024, 1 + i % 6, 1 + i % 28),
+            raw_service=SERVICES[i % len(SERVICES)],
+            amount=round(50.0 + 37.5 * i, 2),
+            raw_payment_method=PAYMENT_METHODS[i % len(PAYMENT_METHODS)],
+            city=CITIES[i % len(CITIES)],
+        )
+        for i in range(40)
+    ]
+    TransactionRepository(session).add_many(transactions)
+    ClientRepository(session).add_many(
+        Client(id=client_id, age=40, gender=Gender.FEMALE, net_worth=worth)
+        for client_id, worth in zip(client_ids, NET_WORTHS, strict=True)
+    )
+    TransactionRepository(session).sync_client_attributes()
+    return transactions
+
+
+def test_net_worth_levels_match_per_client_grouping(
+    session, transactions
+) -> None:
+    rows = (
+        session
+        .query(
+            ClientTable.net_worth,
+            func.sum(TransactionTable.amount).label("total_revenue"),
+            func.count(TransactionTable.id).label("transaction_count"),
+        )
+        .join(TransactionTable, ClientTable.id == TransactionTable.client_id)
+        .group_by(ClientTable.id)
+        .all()
+    )
+    revenue: dict[str, float] = defaultdict(float)
+    count: Counter[str] = Counter()
+    for row in rows:
+        if row.net_worth < 100_000:
+            level = "Низкий капитал"
+        elif row.net_worth <= 1_000_000:
+            level = "Средний капитал"
+        else:
+            level = "Высокий капитал"
+        revenue[level] += row.total_revenue
+        count[level] += row.transaction_count
+
+    levels = ClientRepository(session).get_revenue_by_net_worth_level()
+
+    assert [
+        (level["name"], level["revenue"], level["count"]) for level in levels
+    ] == [
+        (name, pytest.approx(revenue[name]), count[name])
+        for name in ("Низкий капитал", "Средний капитал", "Высокий капитал")
+    ]
+
+
+def test_segments_match_join_query(session, transactions) -> None:
+    segment_case = case(
+        (ClientTable.net_worth < 100_000, "Низкий капитал"),
+        (
+            ClientTable.net_worth.between(100_000, 1_000_000),
+            "Средний капитал",
+        ),
+        (ClientTable.net_worth > 1_000_000, "Высокий капитал"),
+        else_="Неизвестно",
+    ).label("segment")
+    rows = (
+        session
+        .query(
+            segment_case,
+            func.count(ClientTable.id.distinct()).label("client_count"),
+            func.sum(TransactionTable.amount).label("total_revenue"),
+            func.count(TransactionTable.id).label("transaction_count"),
+            func.avg(TransactionTable.amount).label("avg_transaction"),
+        )
+        .join(
+            TransactionTable,
+            ClientTable.id == TransactionTable.client_id,
+            isouter=True,
+        )
+        .group_by("segment")
+        .order_by(desc("total_revenue"))
+        .all()
+    )
+    expected = [
+        {
+            "segment": r.segment,
+            "client_count": r.client_count,
+            "total_revenue": r.total_revenue or 0,
+            "transaction_count": r.transaction_count or 0,
+            "avg_transaction": round(r.avg_transaction or 0, 2),
+        }
+        for r in rows
+    ]
+
+    segments = ClientRepository(session).get_detailed_revenue_by_segment()
+
+    assert segments == expected
+
+
+def test_clients_without_transactions(session, transactions) -> None:
+    assert ClientRepository(session).get_clients_without_transactions() == 1
+
+
+def test_service_performance_matches_reference(session, transactions) -> None:
+    amounts: dict[str, list[float]] = defaultdict(list)
+    for t in transactions:
+        amounts[t.raw_service].append(t.amount)
+    repo = TransactionRepository(session)
+
+    services = repo.enrich_with_percentages(repo.get_service_performance())
+
+    total_revenue = sum(t.amount for t in transactions)
+    assert {s["service"]: s for s in services} == {
+        service: {
+            "service": service,
+            "order_count": len(values),
+            "total_revenue": pytest.approx(sum(values)),
+            "avg_amount": round(sum(values) / len(values), 2),
+            "min_amount": min(values),
+            "max_amount": max(values),
+            "revenue_percentage": round(sum(values) / total_revenue * 100, 2),
+            "order_percentage": round(
+                len(values) / len(transactions) * 100, 2
+            ),
+        }
+        for service, values in amounts.items()
+    }
+    assert [s["total_revenue"] for s in services] == sorted(
+        (s["total_revenue"] for s in services), reverse=True
+    )
+
+
+def test_counts_and_distributions_match_reference(
+    session, transactions
+) -> None:
+    repo = TransactionRepository(session)
+    by_service = Counter(t.raw_service for t in transactions)
+    by_method = Counter(t.raw_payment_method for t in transactions)
+    by_city: dict[str, list[float]] = defaultdict(list)
+    for t in transactions:
+        if t.city:
+            by_city[t.city].append(t.amount)
+
+    assert {
+        row["service"]: row["count"]
+        for row in repo.get_top_services_by_count(limit=len(SERVICES))
+    } == dict(by_service)
+    assert repo.get_payment_method_distribution() == {
+        method: round(count * 100 / len(transactions), 2)
+        for method, count in by_method.items()
+    }
+    assert {
+        row["city"]: (row["avg_amount"], row["count"])
+        for row in repo.get_avg_amount_by_city()
+    } == {
+        city: (round(sum(values) / len(values), 2), len(values))
+        for city, values in by_city.items()
+    }
+
+
+def test_cached_results_are_invalidated_by_writes(
+    session, transactions
+) -> None:
+    repo = TransactionRepository(session)
+    before = repo.get_payment_method_distribution()
+
+    repo.add_many([
+        transactions[0].model_copy(
+            update={"id": uuid4(), "raw_payment_method": "Криптовалюта"}
+        )
+    ])
+
+    after = repo.get_payment_method_distribution()
+    assert "Криптовалюта" not in before
+    assert after["Криптовалюта"] == round(100 / (len(transactions) + 1), 2)
+
+
+def test_uncommitted_reads_are_not_shared(tmp_path, transactions) -> None:
+    warehouse = create_warehouse(tmp_path / "warehouse.db")
+    extra = transactions[0].model_copy(update={"id": uuid4()})
+    try:
+        with warehouse.get_session() as writer:
+            TransactionRepository(writer).add_many(transactions)
+            writer.commit()
+            committed = TransactionRepository(
+                writer
+            ).get_payment_method_distribution()
+
+            repo = TransactionRepository(writer)
+            repo.add_many([extra])
+            uncommitted = repo.get_payment_method_distribution()
+            writer.rollback()
+
+        with warehouse.get_session() as reader:
+            distribution = TransactionRepository(
+                reader
+            ).get_payment_method_distribution()
+
+        assert uncommitted != committed
+        assert distribution == committed
+    finally:
+        warehouse.close()
+
+
+def test_commit_invalidates_results_cached_meanwhile(tmp_path) -> None:
+    warehouse = create_warehouse(tmp_path / "warehouse.db")
+    try:
+        with (
+            warehouse.get_session() as writer,
+            warehouse.get_session() as reader,
+        ):
+            TransactionRepository(writer).add_many([
+                Transaction(id=uuid4(), amount=10.0, raw_service="Другое")
+            ])
+            before = TransactionRepository(reader).get_top_services_by_count()
+            reader.rollback()
+            writer.commit()
+
+            after = TransactionRepository(reader).get_top_services_by_count()
+
+        assert before == []
+        assert after == [{"service": "Другое", "count": 1}]
+    finally:
+        warehouse.close()
+
+
+def test_latest_result_round_trips(session) -> None:
+    repo = AnalysisRepository(session)
+    payload = {"run": 1, "values": [1.5, None], "name": "Москва"}
+    repo.save_result("full_analysis", payload)
+
+    first = repo.get_latest_result("full_analysis")
+    assert first == payload
+    assert first is not None
+    first["run"] = 2
+
+    # A cache hit still hands out an independent copy.
+    assert repo.get_latest_result("full_analysis") == payload
+    assert repo.get_latest_result("missing") is None
+
+
+def test_payload_read_for_document_storage(session) -> None:
+    # JSONB on PostgreSQL returns a document rather than raw bytes; the
+    # document branch must hand back the same orjson bytes.
+    repo = AnalysisRepository(session)
+    payload = {"run": 1, "city": "Москва"}
+    repo.save_result("full_analysis", payload)
+    result_id = session.scalar(select(AnalysisResultTable.id))
+
+    raw = repo._fetch_payload(result_id, session.get_bind().dialect)
+    document = repo._fetch_payload(result_id, postgresql.dialect())
+
+    assert raw is not None
+    assert document is not None
+    assert orjson.loads(raw) == orjson.loads(document) == payload
@@ -0,0 +1,153 @@
+"""Tests for data file fingerprints and their warehouse stamp."""
+
+import os
+from datetime import datetime
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+import run_pipeline
+
+from app.application.use_cases.warehouse import BuildWarehouseUseCase
+from app.domain.entities import Transaction
+from app.infrastructure.database import AnalysisRepository
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def data_files(tmp_path: Path) -> tuple[Path, Path]:
+    transactions = tmp_path / "transactions.xlsx"
+    clients = tmp_path / "clients.json"
+    transactions.write_bytes(b"transactions v1")
+    clients.write_bytes(b"clients v1")
+    return transactions, clients
+
+
+@pytest.fixture
+def no_hashing(monkeypatch) -> None:
+    def fail(file_path: Path) -> str:
+        raise AssertionError(f"{file_path} was hashed")
+
+    monkeypatch.setattr(run_pipeline, "get_file_hash", fail)
+
+
+class TestFileFingerprint:
+    def test_hashes_new_file(self, data_files) -> None:
+        transactions, _ = data_files
+
+        fingerprint = run_pipeline.get_file_fingerprint(transactions)
+
+        assert fingerprint["sha256"] == run_pipeline.get_file_hash(
+            transactions
+        )
+
+    def test_reuses_hash_of_unchanged_file(
+        self, data_files, no_hashing
+    ) -> None:
+        transactions, _ = data_files
+        stat = transactions.stat()
+        saved = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": "saved",
+        }
+
+        fingerprint = run_pipeline.get_file_fingerprint(transactions, saved)
+
+        assert fingerprint == saved
+
+    def test_rehashes_touched_file(self, data_files) -> None:
+        transactions, _ = data_files
+        saved = run_pipeline.get_file_fingerprint(transactions)
+        transactions.write_bytes(b"transactions v2")
+        os.utime(transactions, ns=(0, saved["mtime_ns"] + 1))
+
+        fingerprint = run_pipeline.get_file_fingerprint(transactions, saved)
+
+        assert fingerprint["sha256"] != saved["sha256"]
+
+
+class TestShouldClearDatabase:
+    def test_unchanged_files_take_fast_path(
+        self, data_files, tmp_path, monkeypatch
+    ) -> None:
+        hash_file = tmp_path / ".data_hashes.json"
+        changed, fingerprints = run_pipeline.should_clear_database(
+            *data_files, hash_file
+        )
+        monkeypatch.setattr(
+            run_pipeline,
+            "get_file_hash",
+            lambda file_path: pytest.fail(f"{file_path} was hashed"),
+        )
+
+        changed_again, fingerprints_again = run_pipeline.should_clear_database(
+            *data_files, hash_file
+        )
+
+        assert changed
+        assert not changed_again
+        assert fingerprints_again == fingerprints
+        assert run_pipeline.read_hash_file(hash_file) == fingerprints
+
+    def test_detects_changed_content(self, data_files, tmp_path) -> None:
+        transactions, clients = data_files
+        hash_file = tmp_path / ".data_hashes.json"
+        run_pipeline.should_clear_database(transactions, clients, hash_file)
+        clients.write_bytes(b"clients v2")
+
+        changed, _ = run_pipeline.should_clear_database(
+            transactions, clients, hash_file
+        )
+
+        assert changed
+
+
+class _StubLoaderFactory:
+    """Loader factory serving fixed records instead of reading files."""
+
+    class _TransactionLoader:
+        def load(self, source: Path):
+            yield Transaction(
+                id=uuid4(),
+                transaction_date=datetime(2024, 3, 1),
+                raw_service="Управление активами",
+                amount=100.0,
+                raw_payment_method="Наличные",
+            )
+
+    class _ClientLoader:
+        skipped = 0
+
+        def load_rows(self, source: Path):
+            yield [
+                {
+                    "id": str(uuid4()),
+                    "age": 30,
+                    "gender": "Мужчина",
+                    "net_worth": 1.0,
+                }
+            ]
+
+    def get_transaction_loader(self, path: Path):
+        return self._TransactionLoader()
+
+    def get_client_loader(self, path: Path):
+        return self._ClientLoader()
+
+
+def test_build_stamps_fingerprints(warehouse, data_files) -> None:
+    fingerprints = run_pipeline.get_data_fingerprints(*data_files, {})
+    use_case = BuildWarehouseUseCase(
+        warehouse,
+        loader_factory=_StubLoaderFactory(),  # type: ignore[arg-type]
+    )
+
+    use_case.execute(*data_files, data_fingerprints=fingerprints)
+
+    with warehouse.get_session() as session:
+        stamp = AnalysisRepository(session).get_latest_result(
+            BuildWarehouseUseCase.DATA_FINGERPRINTS_RESULT
+        )
+    assert stamp == fingerprints
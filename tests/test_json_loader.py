@@ -0,0 +1,194 @@
+"""Tests for the client JSON loader row output."""
+
+from pathlib import Path
+
+import orjson
+import pytest
+
+from app.infrastructure.data_loading import ClientJsonLoader, json_loader
+
+pytestmark = pytest.mark.unit
+
+RECORDS = [
+    {"id": None, "age": 41, "gender": "Мужчина", "net_worth": 1.0},
+    {"id": "null", "age": 41, "gender": "Мужчина", "net_worth": 1.0},
+    {
+        "id": "0f8fad5b-d9cb-469f-a165-70867728950e",
+        "age": 41.0,
+        "gender": "Женщина",
+        "net_worth": 2514729.46,
+    },
+    {
+        "id": "7c9e6679-7425-40de-944b-e07fc1f90ae7",
+        "age": 200,
+        "gender": "Мужчина",
+        "net_worth": 1.0,
+    },
+    {
+        "id": "1b9d6bcd-bbfd-4b2d-9b5d-ab8dfbbd4bed",
+        "age": "33",
+        "gender": None,
+        "net_worth": "1e5",
+    },
+    {
+        "id": "6ec0bd7f-11c0-43da-975e-2a8ad9ebae0b",
+        "age": 41,
+        "gender": "Другой",
+        "net_worth": "12345,5",
+    },
+    {
+        "id": "c9bf9e57-1685-4c89-bafb-ff5af830be8a",
+        "age": 41,
+        "gender": "Мужчина",
+        "net_worth": -5,
+    },
+    {
+        "id": "a8098c1a-f86e-11da-bd1a-00112444be1e",
+        "age": 41.5,
+        "gender": "Мужчина",
+        "net_worth": 1.0,
+    },
+    {
+        "id": "e4eaaaf2-d142-11e1-b3e4-080027620cdd",
+        "age": 30,
+        "gender": " Мужчина ",
+        "net_worth": 0,
+    },
+    5,
+    {
+        "id": "16fd2706-8baf-433b-82eb-8c7fada847da",
+        "age": 30,
+        "gender": "Мужчина",
+        "net_worth": None,
+    },
+]
+
+# Client records the loader rejects; the bare 5 is dropped as malformed
+# input before validation and is not counted.
+SKIPPED = 6
+
+# What the entity-based loader produced for RECORDS before rows were
+# emitted directly.
+EXPECTED_ROWS = [
+    {
+        "id": "0f8fad5b-d9cb-469f-a165-70867728950e",
+        "age": 41,
+        "gender": "Женщина",
+        "net_worth": 2514729.46,
+    },
+    {
+        "id": "1b9d6bcd-bbfd-4b2d-9b5d-ab8dfbbd4bed",
+        "age": 33,
+        "gender": "Не указан",
+        "net_worth": 100000.0,
+    },
+    {
+        "id": "6ec0bd7f-11c0-43da-975e-2a8ad9ebae0b",
+        "age": 41,
+        "gender": "Другой",
+        "net_worth": 12345.5,
+    },
+    {
+        "id": "e4eaaaf2-d142-11e1-b3e4-080027620cdd",
+        "age": 30,
+        "gender": "Мужчина",
+        "net_worth": 0.0,
+    },
+]
+
+
+@pytest.fixture
+def array_file(tmp_path: Path) -> Path:
+    path = tmp_path / "clients.json"
+    path.write_bytes(orjson.dumps(RECORDS))
+    return path
+
+
+@pytest.fixture
+def lines_file(tmp_path: Path) -> Path:
+    path = tmp_path / "clients_lines.json"
+    path.write_bytes(b"\n".join(orjson.dumps(r) for r in RECORDS))
+    return path
+
+
+def _rows(loader: ClientJsonLoader, source: Path) -> list[dict]:
+    return [row for rows in loader.load_rows(source) for row in rows]
+
+
+@pytest.mark.parametrize("source", ["array_file", "lines_file"])
+def test_load_rows_matches_entity_loader(source, request) -> None:
+    path = request.getfixturevalue(source)
+
+    loader = ClientJsonLoader(workers=1)
+
+    assert _rows(loader, path) == EXPECTED_ROWS
+    assert loader.skipped == SKIPPED
+
+
+def test_load_rows_batches_by_chunk_size(array_file) -> None:
+    loader = ClientJsonLoader(chunk_size=3, workers=1)
+
+    batches = list(loader.load_rows(array_file))
+
+    assert all(len(rows) <= 3 for rows in batches)
+    assert [row for rows in batches for row in rows] == EXPECTED_ROWS
+
+
+def test_load_builds_clients_from_rows(array_file) -> None:
+    clients = list(ClientJsonLoader(workers=1).load(array_file))
+
+    assert [
+        {
+            "id": str(client.id),
+            "age": client.age,
+            "gender": client.gender.value,
+            "net_worth": client.net_worth,
+        }
+        for client in clients
+    ] == EXPECTED_ROWS
+
+
+@pytest.mark.slow
+def test_parallel_lines_match_serial(lines_file, monkeypatch) -> None:
+    monkeypatch.setattr(ClientJsonLoader, "PARALLEL_MIN_FILE_SIZE", 0)
+
+    loader = ClientJsonLoader(chunk_size=2, workers=3)
+
+    rows = _rows(loader, lines_file)
+
+    assert sorted(rows, key=lambda row: row["id"]) == sorted(
+        EXPECTED_ROWS, key=lambda row: row["id"]
+    )
+    assert loader.skipped == SKIPPED
+
+
+class _LogRecorder:
+    """Stand-in for the module logger that keeps every message."""
+
+    def __init__(self) -> None:
+        self.messages: list[str] = []
+
+    def log(self, level: int, message: str) -> None:
+        self.messages.append(message)
+
+    def __getattr__(self, name: str):
+        return lambda message, *args, **kwargs: self.messages.append(message)
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("workers", [1, 3])
+def test_reports_absolute_line_numbers(tmp_path, monkeypatch, workers) -> None:
+    lines = [orjson.dumps(RECORDS[2])] * 30
+    lines[24] = b'{"id": broken}'
+    path = tmp_path / "clients_lines.json"
+    path.write_bytes(b"\n".join(lines))
+    recorder = _LogRecorder()
+    monkeypatch.setattr(json_loader, "logger", recorder)
+    monkeypatch.setattr(ClientJsonLoader, "PARALLEL_MIN_FILE_SIZE", 0)
+
+    rows = _rows(ClientJsonLoader(chunk_size=4, workers=workers), path)
+
+    assert len(rows) == 29
+    assert any(
+        m.startswith("Failed to parse line 25:") for m in recorder.messages
+    )
@@ -0,0 +1,99 @@
+"""Tests for handler cleanup in the logger manager."""
+
+import io
+import logging
+import sys
+from logging.handlers import QueueListener
+from pathlib import Path
+from queue import SimpleQueue
+from typing import TextIO
+
+import pytest
+
+from app.infrastructure.logger.manager import LoggerManager
+from app.utils import Singleton
+
+pytestmark = pytest.mark.unit
+
+
+class _RecordingHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.closed = 0
+
+    def close(self) -> None:
+        self.closed += 1
+        super().close()
+
+
+class _RecordingStreamHandler(logging.StreamHandler):
+    def __init__(self, stream: TextIO) -> None:
+        super().__init__(stream)
+        self.closed = 0
+
+    def close(self) -> None:
+        self.closed += 1
+        super().close()
+
+
+def test_closes_only_stream_and_file_handlers(tmp_path: Path) -> None:
+    file_handler = logging.FileHandler(tmp_path / "app.log", delay=False)
+    other = _RecordingHandler()
+
+    LoggerManager._close_replaced_handlers([file_handler, other])
+
+    assert file_handler.stream is None
+    assert other.closed == 0
+
+
+def test_closes_every_owned_handler() -> None:
+    stream = io.StringIO()
+    handlers = [
+        _RecordingStreamHandler(stream),
+        _RecordingStreamHandler(stream),
+        _RecordingStreamHandler(io.StringIO()),
+    ]
+
+    LoggerManager._close_replaced_handlers(list(handlers))
+
+    assert [handler.closed for handler in handlers] == [1, 1, 1]
+
+
+def test_leaves_std_stream_handlers_open() -> None:
+    handler = _RecordingStreamHandler(sys.stderr)
+
+    LoggerManager._close_replaced_handlers([handler])
+
+    assert handler.closed == 0
+
+
+class _Resource(metaclass=Singleton):
+    def __init__(self) -> None:
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.mark.parametrize("close", [False, True])
+def test_clear_singleton_closes_only_when_asked(close: bool) -> None:
+    resource = _Resource()
+
+    Singleton.clear_singleton(_Resource, close=close)
+
+    assert resource.closed is close
+    assert _Resource() is not resource
+
+
+def test_close_releases_buffered_log_files(tmp_path: Path) -> None:
+    manager = object.__new__(LoggerManager)
+    manager.__init__()
+    file_handler = logging.FileHandler(tmp_path / "app.log", delay=False)
+    manager._listener = QueueListener(
+        SimpleQueue(), manager._buffer_file_handler(file_handler)
+    )
+    manager._listener.start()
+
+    manager.close()
+
+    assert file_handler.stream is None
@@ -0,0 +1,324 @@
+"""Tests for the bulk write paths of the repositories."""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import ClassVar
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session, aliased
+
+from app.domain.entities import Client, Gender, Transaction
+from app.infrastructure.database import (
+    ClientRepository,
+    ClientTable,
+    TransactionRepository,
+    TransactionTable,
+)
+from app.infrastructure.database.models import IdMapTable
+from app.infrastructure.database.repository import IdDict, QueryCache
+
+pytestmark = pytest.mark.unit
+
+
+def _transaction(
+    transaction_id: UUID,
+    amount: float,
+    client_id: UUID | None = None,
+    transaction_date: datetime = datetime(2024, 3, 15, 12, 30),
+    service: str = "Управление активами",
+) -> Transaction:
+    return Transaction(
+        id=transaction_id,
+        client_id=client_id,
+        transaction_date=transaction_date,
+        raw_service=service,
+        amount=amount,
+        raw_payment_method="Наличные",
+        city="Москва",
+        consultant="Иванов",
+    )
+
+
+def _client(client_id: UUID, net_worth: float) -> Client:
+    return Client(
+        id=client_id, age=40, gender=Gender.MALE, net_worth=net_worth
+    )
+
+
+def _transaction_rows(session: Session) -> list[tuple]:
+    """Stored transactions with their ids decoded back to strings."""
+    tx_id = aliased(IdMapTable)
+    client_id = aliased(IdMapTable)
+    return sorted(
+        session.execute(
+            select(
+                tx_id.str_id,
+                client_id.str_id,
+                TransactionTable.transaction_date,
+                TransactionTable.raw_service,
+                TransactionTable.service_category,
+                TransactionTable.amount,
+                TransactionTable.raw_payment_method,
+                TransactionTable.payment_method_category,
+                TransactionTable.city,
+                TransactionTable.consultant,
+            )
+            .join(tx_id, tx_id.int_id == TransactionTable.id)
+            .outerjoin(
+                client_id, client_id.int_id == TransactionTable.client_id
+            )
+        ).all()
+    )
+
+
+class TestQueryCache:
+    def test_evicts_least_recently_used(self, monkeypatch) -> None:
+        monkeypatch.setattr(QueryCache, "MAX_ENTRIES", 2)
+        cache = QueryCache()
+        cache.put("a", b"1")
+        cache.put("b", b"2")
+        cache.get("a")
+
+        cache.put("c", b"3")
+
+        assert (cache.get("a"), cache.get("b"), cache.get("c")) == (
+            b"1",
+            None,
+            b"3",
+        )
+
+    def test_concurrent_access(self, warehouse, monkeypatch) -> None:
+        monkeypatch.setattr(QueryCache, "MAX_ENTRIES", 8)
+
+        def worker(n: int) -> QueryCache:
+            cache = QueryCache.for_engine(warehouse.engine)
+            for i in range(500):
+                key = (n, i % 16)
+                cache.put(key, b"x")
+                cache.get(key)
+                if i % 100 == 0:
+                    cache.invalidate()
+            return cache
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            caches = set(pool.map(worker, range(8)))
+
+        assert len(caches) == 1
+        assert len(caches.pop()._entries) <= QueryCache.MAX_ENTRIES
+
+
+class TestIdDict:
+    def test_encode_is_stable_across_sessions(self, warehouse) -> None:
+        ids = [str(uuid4()) for _ in range(3)]
+
+        with warehouse.get_session() as session:
+            first = dict(IdDict(session).encode_many(ids))
+            session.commit()
+
+        with warehouse.get_session() as session:
+            id_dict = IdDict(session)
+            second = dict(id_dict.encode_many(reversed(ids)))
+            assert id_dict.encode(ids[1]) == first[ids[1]]
+
+        assert first == second
+        assert len(set(first.values())) == len(ids)
+
+    def test_encode_many_deduplicates_input(self, session) -> None:
+        str_id = str(uuid4())
+
+        encoded = IdDict(session).encode_many([str_id, str_id])
+
+        assert list(encoded) == [str_id]
+
+    def test_encode_many_spans_lookup_batches(self, session) -> None:
+        ids = [str(uuid4()) for _ in range(IdDict.LOOKUP_BATCH_SIZE + 5)]
+
+        encoded = IdDict(session).encode_many(ids)
+
+        assert set(encoded) == set(ids)
+        assert len(set(encoded.values())) == len(ids)
+
+
+class TestTransactionUpsert:
+    def test_add_many_matches_merge(self, warehouse) -> None:
+        client_id = uuid4()
+        transactions = [
+            _transaction(uuid4(), 100.0 + i, client_id) for i in range(5)
+        ]
+        transactions.append(_transaction(uuid4(), 42.0))
+
+        with warehouse.get_session() as merged:
+            repo = TransactionRepository(merged)
+            for transaction in transactions:
+                repo.add(transaction)
+            merged.flush()
+            expected = _transaction_rows(merged)
+            merged.rollback()
+
+        with warehouse.get_session() as bulk:
+            TransactionRepository(bulk).add_many(transactions)
+            assert _transaction_rows(bulk) == expected
+
+    def test_add_many_keeps_last_duplicate(self, session) -> None:
+        transaction_id = uuid4()
+        repo = TransactionRepository(session)
+
+        repo.add_many([
+            _transaction(transaction_id, 10.0),
+            _transaction(transaction_id, 20.0),
+        ])
+        repo.add_many([_transaction(transaction_id, 30.0)])
+
+        assert session.scalars(select(TransactionTable.amount)).all() == [30.0]
+
+    def test_add_many_spans_batches(self, session, monkeypatch) -> None:
+        monkeypatch.setattr(TransactionRepository, "BULK_BATCH_SIZE", 2)
+        repo = TransactionRepository(session)
+
+        repo.add_many(_transaction(uuid4(), 1.0 + i) for i in range(5))
+
+        assert len(_transaction_rows(session)) == 5
+
+    def test_client_ids_share_encoding(self, session) -> None:
+        client_id = uuid4()
+
+        TransactionRepository(session).add_many([
+            _transaction(uuid4(), 10.0, client_id)
+        ])
+        ClientRepository(session).add_many([_client(client_id, 5_000.0)])
+
+        assert session.scalar(select(TransactionTable.client_id)) == (
+            session.scalar(select(ClientTable.id))
+        )
+
+
+class TestClientUpsert:
+    def test_add_many_matches_merge(self, warehouse) -> None:
+        clients = [_client(uuid4(), 1_000.0 * i) for i in range(1, 4)]
+        columns = (
+            IdMapTable.str_id,
+            ClientTable.age,
+            ClientTable.gender,
+            ClientTable.net_worth,
+            ClientTable.segment,
+        )
+        query = select(*columns).join(
+            IdMapTable, IdMapTable.int_id == ClientTable.id
+        )
+
+        with warehouse.get_session() as merged:
+            repo = ClientRepository(merged)
+            for client in clients:
+                repo.add(client)
+            merged.flush()
+            expected = sorted(merged.execute(query).all())
+            merged.rollback()
+
+        with warehouse.get_session() as bulk:
+            ClientRepository(bulk).add_many(clients)
+            actual = sorted(bulk.execute(query).all())
+
+        assert actual == expected
+
+    def test_add_rows_overwrites_existing(self, session) -> None:
+        client_id = str(uuid4())
+        repo = ClientRepository(session)
+        row = {"id": client_id, "age": 30, "gender": None, "net_worth": 1.0}
+
+        repo.add_rows([row])
+        repo.add_rows([{**row, "age": 31, "net_worth": 2_000_000.0}])
+
+        client = session.scalars(select(ClientTable)).one()
+        assert (client.age, client.net_worth) == (31, 2_000_000.0)
+
+
+class TestDashboardBundle:
+    DATES: ClassVar = [
+        datetime(2023, 3, 31, 23, 59),
+        datetime(2023, 4, 1),
+        datetime(2024, 1, 15, 9),
+        datetime(2024, 2, 1),
+        datetime(2024, 2, 29, 18, 45),
+        datetime(2024, 2, 29),
+        datetime(2024, 3, 1),
+        datetime(2024, 3, 10, 8),
+    ]
+    SERVICES: ClassVar = ["Управление активами", "Налоговое планирование"]
+
+    @pytest.fixture
+    def transactions(self, session) -> list[Transaction]:
+        transactions = [
+            _transaction(
+                uuid4(),
+                100.0 * (i + 1),
+                transaction_date=date,
+                service=self.SERVICES[i % 2],
+            )
+            for i, date in enumerate(self.DATES)
+        ]
+        TransactionRepository(session).add_many(transactions)
+        return transactions
+
+    def test_last_month_covers_whole_calendar_month(
+        self, session, transactions
+    ) -> None:
+        expected = sum(
+            t.amount
+            for t in transactions
+            if datetime(2024, 2, 1)
+            <= t.transaction_date
+            < datetime(2024, 3, 1)
+        )
+        repo = TransactionRepository(session)
+
+        assert repo.get_last_month_revenue() == pytest.approx(expected)
+        assert repo.get_dashboard_bundle()["last_month_revenue"] == (
+            pytest.approx(expected)
+        )
+
+    @pytest.mark.parametrize("months", [1, 6, 12])
+    def test_matches_individual_queries(
+        self, session, transactions, months
+    ) -> None:
+        repo = TransactionRepository(session)
+
+        bundle = repo.get_dashboard_bundle(months)
+
+        assert bundle == {
+            "last_month_revenue": repo.get_last_month_revenue(),
+            "monthly_trend": repo.get_monthly_revenue_trend(months),
+            "service_performance": repo.get_service_performance(),
+        }
+
+    def test_monthly_trend_matches_reference(
+        self, session, transactions
+    ) -> None:
+        totals: dict[str, list[float]] = {}
+        for t in transactions:
+            if t.transaction_date >= datetime(2023, 3, 1):
+                period = t.transaction_date.strftime("%Y-%m")
+                totals.setdefault(period, []).append(t.amount)
+
+        trend = TransactionRepository(session).get_dashboard_bundle(12)[
+            "monthly_trend"
+        ]
+
+        assert [
+            (row["period"], row["revenue"], row["transaction_count"])
+            for row in trend
+        ] == [
+            (period, pytest.approx(sum(amounts)), len(amounts))
+            for period, amounts in sorted(totals.items())
+        ]
+
+    def test_empty_warehouse(self, session) -> None:
+        repo = TransactionRepository(session)
+
+        assert repo.get_last_month_revenue() == pytest.approx(0.0)
+        assert repo.get_dashboard_bundle() == {
+            "last_month_revenue": 0.0,
+            "monthly_trend": [],
+            "service_performance": [],
+        }
@@ -0,0 +1,93 @@
+"""Tests for warehouse session handling."""
+
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+
+from app.infrastructure.database import Warehouse, create_warehouse
+
+pytestmark = pytest.mark.unit
+
+SYNCHRONOUS_OFF = 0
+SYNCHRONOUS_NORMAL = 1
+
+
+def test_bulk_load_restores_synchronous_on_its_connection(
+    tmp_path: Path,
+) -> None:
+    warehouse = create_warehouse(tmp_path / "warehouse.db")
+    assert warehouse.engine is not None
+    # Put two idle connections in the pool, so a released connection is
+    # not simply handed out again.
+    first, second = warehouse.engine.connect(), warehouse.engine.connect()
+    first.close()
+    second.close()
+    try:
+        with warehouse.bulk_load() as session:
+            raw = session.connection().connection.dbapi_connection
+            session.execute(text("CREATE TABLE t (x INTEGER)"))
+            session.commit()
+            # A commit must not move the session to another connection.
+            assert session.connection().connection.dbapi_connection is raw
+            assert (
+                session.scalar(text("PRAGMA synchronous")) == SYNCHRONOUS_OFF
+            )
+
+        assert raw is not None
+        assert (
+            raw.execute("PRAGMA synchronous").fetchone()[0]
+            == SYNCHRONOUS_NORMAL
+        )
+        with warehouse.get_session() as session:
+            assert session.scalar(text("SELECT count(*) FROM t")) == 0
+    finally:
+        warehouse.close()
+
+
+@pytest.fixture
+def outdated_db(tmp_path: Path) -> Path:
+    """Database file in the layout used before surrogate ids."""
+    path = tmp_path / "old.db"
+    with closing(sqlite3.connect(path)) as connection:
+        connection.execute(
+            "CREATE TABLE client_tables (id VARCHAR(36) PRIMARY KEY, "
+            "age INTEGER, gender VARCHAR(20), net_worth FLOAT)"
+        )
+        connection.commit()
+    return path
+
+
+def test_outdated_schema_fails_with_clear_message(outdated_db) -> None:
+    assert not Warehouse.schema_is_current(outdated_db)
+
+    with pytest.raises(RuntimeError, match="--clear-db"):
+        create_warehouse(outdated_db)
+
+
+def test_outdated_schema_is_recreated_on_request(outdated_db) -> None:
+    warehouse = create_warehouse(outdated_db, reset_outdated_schema=True)
+    try:
+        with warehouse.get_session() as session:
+            assert (
+                session.scalar(
+                    text("SELECT count(segment) FROM client_tables")
+                )
+                == 0
+            )
+    finally:
+        warehouse.close()
+
+    assert Warehouse.schema_is_current(outdated_db)
+    create_warehouse(outdated_db).close()
+
+
+def test_new_and_empty_databases_are_current(tmp_path: Path) -> None:
+    empty = tmp_path / "empty.db"
+    sqlite3.connect(empty).close()
+    create_warehouse(tmp_path / "new.db").close()
+
+    assert Warehouse.schema_is_current(empty)
+    assert Warehouse.schema_is_current(tmp_path / "new.db")